@@ -182,8 +182,8 @@ REST_FRAMEWORK = {
 
     # Throttling
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.AnonRateThrottle',
+        'api.throttling.RedisUserRateThrottle',
+        'api.throttling.RedisAnonRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'user': '10000/day',
@@ -5,6 +5,7 @@ Exporta los elementos principales para uso desde `api.cache`.
 from .cache_utils import (
     CacheManager,
     cache_manager,
+    LocalTTLCache,
     cached_view,
     invalidate_cache_on_save,
     CacheKeys,
@@ -18,7 +19,7 @@ from .cache_views import (
 )
 
 __all__ = [
-    'CacheManager', 'cache_manager', 'cached_view', 'invalidate_cache_on_save',
+    'CacheManager', 'cache_manager', 'LocalTTLCache', 'cached_view', 'invalidate_cache_on_save',
     'CacheKeys', 'CacheTimeouts',
     'get_cache_stats', 'clear_cache_pattern', 'clear_all_cache', 'warm_up_cache'
 ]
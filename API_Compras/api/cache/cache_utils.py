@@ -1,9 +1,12 @@
 from django.core.cache import cache
 from django.conf import settings
 from functools import wraps
+from collections import OrderedDict
 import hashlib
 import json
 import logging
+import threading
+import time
 from typing import Any, Optional, Dict, List, Callable
 from datetime import timedelta
 
@@ -223,6 +226,67 @@ class CacheManager:
 cache_manager = CacheManager()
 
 
+class LocalTTLCache:
+    """
+    Cache LRU en memoria del proceso con expiración por tiempo.
+
+    Pensado para poner delante de Redis en endpoints públicos muy leídos:
+    evita el round trip de red a cambio de servir datos con hasta `ttl`
+    segundos de antigüedad en los procesos que no hicieron la escritura.
+
+    Args:
+        maxsize (int): Cantidad máxima de entradas (se descarta la menos usada).
+        ttl (float): Tiempo de vida de cada entrada en segundos.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Obtiene un valor vigente del cache local.
+
+        Args:
+            key: Clave (cualquier objeto hasheable).
+            default: Valor a devolver si no existe o expiró.
+
+        Returns:
+            Any: Valor almacenado o `default`.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        """
+        Almacena un valor en el cache local.
+
+        Args:
+            key: Clave (cualquier objeto hasheable).
+            value: Valor a almacenar.
+        """
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Elimina todas las entradas del cache local."""
+        with self._lock:
+            self._data.clear()
+
+
 def cached_view(timeout: int = 3600, key_prefix: str = "view"):
     """
     Decorador para cachear vistas de Django REST Framework.
@@ -329,6 +393,8 @@ class CacheKeys:
     CATEGORIES_LIST = "categories:list"
     CATEGORY_DETAIL = "categories:detail"
     CATEGORIES_TREE = "categories:tree"
+    CATEGORIES_VERSION = "categories:version"
+    CATEGORIES_WARM_UP_LOCK = "categories:warm_up_lock"
 
     # Inventario
     INVENTORY_LIST = "inventory:list"
@@ -1,9 +1,73 @@
+from django.db.models import Exists, OuterRef
 from .models import Category
+from api.products.models import ProductCategory
+
+# Columnas que exponen CategoryPublicSerializer / CategoryPrivateSerializer.
+# Los selectores cargan solo estas para no hidratar columnas que no se usan.
+PUBLIC_FIELDS = ("id", "name")
+ADMIN_FIELDS = ("id", "name", "created_by", "created_at", "updated_by", "updated_at")
 
 
 def list_categories_public():
-    return Category.objects.only("id", "name").order_by("name")
+    return Category.objects.only(*PUBLIC_FIELDS).order_by("name")
+
+
+def list_categories_public_values():
+    """
+    Listado público como diccionarios planos {"id", "name"}.
+
+    Evita instanciar modelos y pasar por CategoryPublicSerializer en el
+    endpoint público, que solo expone esos dos campos.
+    """
+    return Category.objects.order_by("name").values(*PUBLIC_FIELDS)
 
 
 def list_categories_admin():
-    return Category.objects.select_related("created_by", "updated_by").order_by("name")
+    """
+    Listado admin de categorías.
+
+    CategoryPrivateSerializer expone created_by/updated_by como PK y DRF los
+    lee de las columnas FK (created_by_id/updated_by_id), así que no hace
+    falta JOIN con la tabla de usuarios: el listado es una sola consulta.
+    """
+    return Category.objects.only(*ADMIN_FIELDS).order_by("name")
+
+
+def list_categories_admin_values():
+    """
+    Listado admin como diccionarios planos con las columnas de CategoryPrivateSerializer.
+
+    created_by/updated_by vienen como el ID del usuario (columna FK).
+    """
+    return Category.objects.order_by("name").values(*ADMIN_FIELDS)
+
+
+def get_category_public(pk):
+    """
+    Categoría con solo las columnas de CategoryPublicSerializer, o None.
+    """
+    return Category.objects.only(*PUBLIC_FIELDS).filter(pk=pk).first()
+
+
+def get_category_admin(pk):
+    """
+    Categoría con solo las columnas de CategoryPrivateSerializer, o None.
+
+    created_by/updated_by se serializan como PK, por lo que basta con las
+    columnas FK sin JOIN a la tabla de usuarios.
+    """
+    return Category.objects.only(*ADMIN_FIELDS).filter(pk=pk).first()
+
+
+def get_category_for_delete(pk):
+    """
+    Devuelve la categoría (solo id y nombre) anotada con `has_products`.
+
+    La existencia de productos asociados se resuelve con un EXISTS sobre la
+    tabla intermedia ProductCategory dentro de la misma consulta.
+    Retorna None si la categoría no existe.
+    """
+    return Category.objects.only("id", "name").annotate(
+        has_products=Exists(
+            ProductCategory.objects.filter(category_id=OuterRef('pk')))
+    ).filter(pk=pk).first()
@@ -1,6 +1,7 @@
 
 from rest_framework import serializers
 from .models import Category
+from .services import build_category_with_promotions_data
 from api.serializer_mixins import AuditableWithUserSerializerMixin, SimpleModelSerializerMixin
 
 
@@ -40,3 +41,64 @@ class CategoryPublicSerializer(SimpleModelSerializerMixin, serializers.ModelSeri
     class Meta(SimpleModelSerializerMixin.Meta):
         model = Category
         fields = ["id", "name"]
+
+
+class CategoryBulkRenameSerializer(serializers.Serializer):
+    """
+    Serializer de entrada para el renombrado masivo de categorías.
+
+    Cada elemento indica el ID de la categoría y su nuevo nombre.
+    """
+    id = serializers.IntegerField(min_value=1)
+    name = serializers.CharField(max_length=120)
+
+    def validate_name(self, value):
+        """Valida que el nombre tenga al menos 2 caracteres."""
+        if len(value.strip()) < 2:
+            raise serializers.ValidationError("El nombre es demasiado corto.")
+        return value.strip()
+
+
+class CategoryWithPromotionsSerializer(serializers.BaseSerializer):
+    """
+    Serializer de solo lectura para categorías con promociones activas.
+
+    Recibe categorías de services.get_categories_with_promotions_queryset()
+    (con los prefetch aplicados) y delega en el servicio la estructura de
+    cada elemento, de modo que la salida es la misma que la del servicio.
+    """
+
+    def to_representation(self, instance):
+        return build_category_with_promotions_data(instance)
+
+
+# Campo sin enlazar reutilizado para formatear fechas igual que DateTimeField
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_category_admin_rows(rows) -> list:
+    """
+    Serializa filas de values() con la misma salida que CategoryPrivateSerializer.
+
+    Evita instanciar modelos y el enlace de campos del ModelSerializer en el
+    listado admin; solo las fechas pasan por DateTimeField para respetar el
+    formato y la zona horaria configurados en DRF.
+
+    Args:
+        rows (Iterable[dict]): Filas de selectors.list_categories_admin_values().
+
+    Returns:
+        list: Diccionarios con id, name, created_by, created_at, updated_by, updated_at.
+    """
+    to_datetime = _datetime_field.to_representation
+    return [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "created_by": row["created_by"],
+            "created_at": to_datetime(row["created_at"]) if row["created_at"] else None,
+            "updated_by": row["updated_by"],
+            "updated_at": to_datetime(row["updated_at"]) if row["updated_at"] else None,
+        }
+        for row in rows
+    ]
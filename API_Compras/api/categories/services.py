@@ -5,6 +5,10 @@ from api.promotions.services import get_active_promotions_category
 from api.promotions.models import Promotion, PromotionRule, PromotionScopeCategory
 from django.utils import timezone
 from django.db import models
+from django.db.models.functions import Lower
+from collections import Counter
+
+BULK_BATCH_SIZE = 500
 
 
 @transaction.atomic
@@ -86,6 +90,267 @@ def rename_category(*, user, category: Category, new_name: str) -> dict:
     }
 
 
+@transaction.atomic
+def create_categories(*, user, names: list[str], skip_existing: bool = False) -> dict:
+    """
+    Crea varias categorías en una sola operación.
+
+    Normaliza los nombres igual que create_category, valida duplicados dentro
+    del lote y contra la base de datos con una sola consulta, y persiste todo
+    con bulk_create dentro de una única transacción.
+
+    Con skip_existing=True (importaciones masivas) los nombres repetidos en el
+    lote o ya existentes se omiten en lugar de rechazar el lote, y el INSERT
+    usa ignore_conflicts para tolerar altas concurrentes del mismo nombre.
+
+    Args:
+        user (User): Usuario que crea las categorías.
+        names (list[str]): Nombres de las nuevas categorías.
+        skip_existing (bool): Omitir nombres repetidos o existentes.
+
+    Raises:
+        exceptions.ValidationError: Nombres repetidos en el lote o ya existentes
+            (solo con skip_existing=False).
+
+    Returns:
+        dict: Respuesta estándar con información de la operación
+            - success (bool): True si la operación fue exitosa
+            - message (str): Mensaje descriptivo de la operación
+            - data (list[Category]): Categorías creadas
+    """
+    names_norm = [name.strip().lower() for name in names]
+    if skip_existing:
+        # Quitar repetidos conservando el orden del lote
+        names_norm = list(dict.fromkeys(names_norm))
+    else:
+        repeated = sorted(name for name, count in Counter(
+            names_norm).items() if count > 1)
+        if repeated:
+            raise exceptions.ValidationError(
+                f"Nombres repetidos en el lote: {repeated}")
+
+    existing = list(Category.objects.annotate(name_lower=Lower("name")).filter(
+        name_lower__in=names_norm).values_list("name", flat=True))
+    if existing and not skip_existing:
+        raise exceptions.ValidationError(
+            f"Ya existen categorías con esos nombres: {existing}")
+
+    existing_lower = {name.lower() for name in existing}
+    names_new = [name for name in names_norm if name not in existing_lower]
+    Category.objects.bulk_create(
+        [Category(name=name, created_by=user, updated_by=user)
+         for name in names_new],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=skip_existing
+    )
+    # MySQL no devuelve los IDs generados por bulk_create
+    categories = list(Category.objects.filter(name__in=names_new))
+    message = f"{len(categories)} categorías creadas exitosamente."
+    if skip_existing and len(names_new) < len(names):
+        message += f" {len(names) - len(names_new)} omitidas por repetidas o existentes."
+    return {
+        "success": True,
+        "message": message,
+        "data": categories
+    }
+
+
+@transaction.atomic
+def rename_categories(*, user, renames: list[dict]) -> dict:
+    """
+    Renombra varias categorías en una sola operación.
+
+    Bloquea las categorías afectadas, valida que los IDs y los nuevos nombres
+    no estén repetidos en el lote ni los nombres usados por otras categorías,
+    y aplica todos los cambios con bulk_update.
+
+    Args:
+        user (User): Usuario que hace la modificación.
+        renames (list[dict]): Lista de cambios con las claves
+            - id (int): ID de la categoría
+            - name (str): Nuevo nombre de la categoría
+
+    Raises:
+        exceptions.ValidationError: Categorías inexistentes, IDs o nombres
+            repetidos en el lote o nombres ya usados por otra categoría.
+
+    Returns:
+        dict: Respuesta estándar con información de la operación
+            - success (bool): True si la operación fue exitosa
+            - message (str): Mensaje descriptivo de la operación
+            - data (list[Category]): Categorías actualizadas
+    """
+    repeated_ids = sorted(pk for pk, count in Counter(
+        item["id"] for item in renames).items() if count > 1)
+    if repeated_ids:
+        raise exceptions.ValidationError(
+            f"IDs repetidos en el lote: {repeated_ids}")
+
+    new_names = {item["id"]: item["name"].strip().lower() for item in renames}
+    repeated = sorted(name for name, count in Counter(
+        new_names.values()).items() if count > 1)
+    if repeated:
+        raise exceptions.ValidationError(
+            f"Nombres repetidos en el lote: {repeated}")
+
+    categories = list(
+        Category.objects.select_for_update().filter(pk__in=new_names))
+    missing = sorted(set(new_names) - {category.pk for category in categories})
+    if missing:
+        raise exceptions.ValidationError(
+            f"No existen las categorías: {missing}")
+
+    taken = list(Category.objects.exclude(pk__in=new_names).annotate(
+        name_lower=Lower("name")).filter(
+        name_lower__in=new_names.values()).values_list("name", flat=True))
+    if taken:
+        raise exceptions.ValidationError(
+            f"Ya existen otras categorías con esos nombres: {taken}")
+
+    # bulk_update no aplica auto_now, se asigna updated_at explícitamente
+    now = timezone.now()
+    for category in categories:
+        category.name = new_names[category.pk]
+        category.updated_by = user
+        category.updated_at = now
+    Category.objects.bulk_update(
+        categories, ["name", "updated_by", "updated_at"],
+        batch_size=BULK_BATCH_SIZE
+    )
+    return {
+        "success": True,
+        "message": f"{len(categories)} categorías renombradas exitosamente.",
+        "data": categories
+    }
+
+
+def get_categories_with_promotions_queryset(*, only_with_promotions: bool = False):
+    """
+    QuerySet perezoso de categorías con sus promociones activas y reglas vigentes.
+
+    El conteo de promociones activas se calcula en SQL y los prefetch se
+    ejecutan recién al evaluar el QuerySet, por lo que si se pagina antes
+    (LIMIT/OFFSET) solo se cargan las promociones de la página solicitada.
+
+    Args:
+        only_with_promotions (bool): Si es True, filtra en la base de datos
+            (EXISTS sobre PromotionScopeCategory) las categorías con al menos
+            una promoción activa.
+
+    Returns:
+        QuerySet[Category]: Categorías anotadas con `promotion_count` y con
+            los scopes activos pre-cargados en `active_promotion_scopes`.
+    """
+    now = timezone.now()
+
+    # Conteo de promociones activas calculado en SQL y scopes activos
+    # pre-cargados en un atributo propio (to_attr), de forma que no se
+    # ejecuten consultas ni COUNT adicionales por categoría
+    categories = Category.objects.only("id", "name").annotate(
+        promotion_count=models.Count(
+            'promotionscopecategory__promotion',
+            filter=models.Q(promotionscopecategory__promotion__active=True),
+            distinct=True
+        )
+    ).prefetch_related(
+        models.Prefetch(
+            'promotionscopecategory_set',
+            queryset=PromotionScopeCategory.objects.filter(
+                promotion__active=True  # Solo promociones activas
+            ).select_related(
+                'promotion'  # ForeignKey - usar select_related para JOIN en SQL
+            ).only(
+                # Solo las columnas que se exponen (y las FK para el prefetch)
+                'id', 'category', 'promotion__id', 'promotion__name', 'promotion__active'
+            ).prefetch_related(
+                models.Prefetch(
+                    'promotion__promotionrule_set',  # Relación inversa 1:N
+                    queryset=PromotionRule.objects.filter(
+                        start_at__lte=now,
+                        end_at__gte=now
+                    ).only(
+                        'id', 'promotion', 'type', 'value', 'priority',
+                        'start_at', 'end_at', 'acumulable'
+                    ),
+                    to_attr='active_rules'  # Almacenar en atributo personalizado
+                )
+            ),
+            to_attr='active_promotion_scopes'
+        )
+    )
+
+    if only_with_promotions:
+        # EXISTS por categoría (índice idx_psc_category_promo): sin JOIN ni
+        # filas duplicadas, por lo que no hace falta distinct()
+        categories = categories.filter(models.Exists(
+            PromotionScopeCategory.objects.filter(
+                category_id=models.OuterRef('pk'),
+                promotion__active=True
+            )
+        ))
+    return categories
+
+
+def build_category_with_promotions_data(category) -> dict:
+    """
+    Estructura una categoría (de get_categories_with_promotions_queryset) como diccionario.
+
+    Args:
+        category (Category): Categoría con los prefetch aplicados.
+
+    Returns:
+        dict: Elemento con `category`, `active_promotions` y `promotion_count`
+            (ver get_all_categories_with_promotions).
+    """
+    # Procesar promociones pre-cargadas (lista vacía si no existen)
+    active_promotions = []
+    for promo_scope in category.active_promotion_scopes:
+        promotion = promo_scope.promotion
+        promotion_data = {
+            'id': promotion.pk,
+            'name': promotion.name,
+            'active': promotion.active,
+            'rules': []
+        }
+
+        # Estructurar reglas vigentes (ya pre-cargadas y filtradas en to_attr)
+        for rule in promotion.active_rules:  # Usar el to_attr personalizado
+            rule_data = {
+                'id': rule.pk,
+                'type': rule.type,
+                'value': rule.value,
+                'priority': rule.priority,
+                'start_at': rule.start_at,
+                'end_at': rule.end_at,
+                'acumulable': rule.acumulable
+            }
+            promotion_data['rules'].append(rule_data)
+
+        active_promotions.append(promotion_data)
+
+    return {
+        'category': {
+            'id': category.pk,
+            'name': category.name,
+        },
+        'active_promotions': active_promotions,  # Lista vacía si no hay promociones
+        'promotion_count': category.promotion_count
+    }
+
+
+def serialize_categories_with_promotions(categories) -> list:
+    """
+    Estructura categorías (de get_categories_with_promotions_queryset) como diccionarios.
+
+    Args:
+        categories (Iterable[Category]): Categorías con los prefetch aplicados.
+
+    Returns:
+        list: Un elemento de build_category_with_promotions_data por categoría.
+    """
+    return [build_category_with_promotions_data(category) for category in categories]
+
+
 def get_all_categories_with_promotions() -> dict:
     """
     Obtiene todas las categorías con sus promociones activas y reglas vigentes asociadas.
@@ -98,16 +363,18 @@ def get_all_categories_with_promotions() -> dict:
 
     Proceso:
         - Ejecuta consulta optimizada para obtener todas las categorías
+        - Calcula en SQL la cantidad de promociones activas de cada categoría
         - Pre-carga promociones activas mediante tabla intermedia PromotionScopeCategory
         - Pre-carga reglas vigentes de cada promoción (filtradas por fechas)
-        - Agrupa datos en memoria para evitar consultas N+1
         - Estructura los datos en formato diccionario para fácil consumo
 
     Optimizaciones aplicadas:
-        - select_related para relaciones ForeignKey (promotion, category)
+        - annotate(Count(..., filter=Q(...))) para el conteo sin COUNT por categoría
+        - Prefetch(..., to_attr=...) para los scopes activos de cada categoría
+        - only(...) en los prefetch para traer solo las columnas expuestas
+        - select_related para relaciones ForeignKey (promotion)
         - prefetch_related para relaciones inversas 1:N (promotion → rules)
         - Filtrado temporal en base de datos usando timezone.now()
-        - Agrupación en memoria con diccionario para acceso O(1)
         - Estructura de datos eficiente para serialización
 
     Validaciones realizadas:
@@ -136,84 +403,12 @@ def get_all_categories_with_promotions() -> dict:
                         - start_at (datetime): Fecha y hora de inicio de la regla
                         - end_at (datetime): Fecha y hora de fin de la regla
                         - acumulable (bool): Indica si la regla es acumulable con otras
+                - promotion_count (int): Cantidad de promociones activas de la categoría
 
     """
 
-    # 1. Obtener todas las categorías (sin filtros para incluir todas)
-    categories = Category.objects.all()
-
-    # 2. Crear diccionario para mapear promociones por categoría
-    promotions_by_category = {}
-
-    # 3. Consulta optimizada usando select_related y prefetch_related correctamente
-    promotions_scopes = PromotionScopeCategory.objects.select_related(
-        'promotion',  # ForeignKey - usar select_related para JOIN en SQL
-        'category'    # ForeignKey - usar select_related para JOIN en SQL
-    ).prefetch_related(
-        models.Prefetch(
-            'promotion__promotionrule_set',  # Relación inversa 1:N - usar prefetch_related
-            queryset=PromotionRule.objects.filter(
-                start_at__lte=timezone.now(),
-                end_at__gte=timezone.now()
-            ),
-            to_attr='active_rules'  # Almacenar en atributo personalizado
-        )
-    ).filter(
-        promotion__active=True  # Solo promociones activas
-    )
-
-    # 4. Agrupar promociones por categoría ID para acceso O(1)
-    for promo_scope in promotions_scopes:
-        category_id = promo_scope.category.pk
-        if category_id not in promotions_by_category:
-            promotions_by_category[category_id] = []
-        promotions_by_category[category_id].append(promo_scope.promotion)
-
-    # 5. Construir resultado final con todas las categorías
-    categories_with_promotions = []
-    for category in categories:
-        # Obtener promociones de la categoría (si existen)
-        category_promotions = promotions_by_category.get(category.pk, [])
-
-        # Inicializar lista de promociones activas
-        active_promotions = []
-
-        # Procesar promociones si existen
-        for promotion in category_promotions:
-            promotion_data = {
-                'id': promotion.pk,
-                'name': promotion.name,
-                'active': promotion.active,
-                'rules': []
-            }
-
-            # Estructurar reglas vigentes (ya pre-cargadas y filtradas en to_attr)
-            for rule in promotion.active_rules:  # Usar el to_attr personalizado
-                rule_data = {
-                    'id': rule.pk,
-                    'type': rule.type,
-                    'value': rule.value,
-                    'priority': rule.priority,
-                    'start_at': rule.start_at,
-                    'end_at': rule.end_at,
-                    'acumulable': rule.acumulable
-                }
-                promotion_data['rules'].append(rule_data)
-
-            active_promotions.append(promotion_data)
-
-        category_data = {
-            'id': category.pk,
-            'name': category.name,
-        }
-
-        # Agregar categoría al resultado (con o sin promociones)
-        categories_with_promotions.append({
-            'category': category_data,
-            'active_promotions': active_promotions  # Lista vacía si no hay promociones
-        })
-
+    categories = get_categories_with_promotions_queryset()
     return {"success": True,
             "message": "Categories retrieved successfully.",
-            "data": categories_with_promotions
+            "data": serialize_categories_with_promotions(categories)
             }
@@ -0,0 +1,113 @@
+from celery import shared_task
+from urllib.parse import urlsplit
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.urls import reverse
+from rest_framework.request import Request
+from api.cache import cache_manager, CacheKeys
+from .utils import categories_list_cache_key, get_categories_cache_version
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Evita que varias escrituras seguidas regeneren el cache en paralelo
+WARM_UP_LOCK_TIMEOUT = 10
+
+
+def _build_internal_request(base_url: str, path: str) -> Request:
+    """
+    Construye un request GET interno para reutilizar el paginador de DRF.
+
+    Args:
+        base_url (str): Esquema y host del request original (ej: https://api.example.com).
+        path (str): Ruta del endpoint a regenerar.
+
+    Returns:
+        Request: Request de DRF sin parámetros de query (página 1).
+    """
+    parts = urlsplit(base_url)
+    http_request = HttpRequest()
+    http_request.method = "GET"
+    http_request.path = http_request.path_info = path
+    http_request.META["HTTP_HOST"] = parts.netloc
+    http_request.META["SERVER_PORT"] = str(
+        parts.port or (443 if parts.scheme == "https" else 80))
+    http_request._get_scheme = lambda: parts.scheme
+    return Request(http_request)
+
+
+def _current_categories_version():
+    """
+    Lee la versión de categorías directamente del cache compartido.
+
+    No usa el cache local del proceso (get_categories_cache_version), que
+    en el worker puede devolver una versión de hasta LOCAL_CACHE_TTL
+    segundos de antigüedad.
+
+    Returns:
+        int | None: Versión vigente, o None si la clave no existe.
+    """
+    return cache_manager.get(CacheKeys.CATEGORIES_VERSION)
+
+
+@shared_task(bind=True, max_retries=3)
+def warm_up_categories_cache(self, base_url: str, version: int = None):
+    """
+    Regenera la primera página de los listados público y admin de categorías.
+
+    Se encola después de invalidar el cache de categorías para que el primer
+    lector tras una escritura obtenga la respuesta desde Redis en lugar de
+    pagar la consulta + serialización (y evitar el efecto thundering herd).
+
+    El lock es por versión: una escritura posterior encola su propio
+    precalentado, que no queda bloqueado por el de la versión anterior. Si la
+    versión cambia mientras se construyen las respuestas, estas pueden
+    contener filas anteriores a esa escritura y se descartan.
+
+    Args:
+        base_url (str): Esquema y host del request que originó la escritura,
+            usado para construir los enlaces next/previous de la paginación.
+        version (int, optional): Versión de categorías generada por la
+            escritura. Por defecto, la versión vigente.
+    """
+    # Import diferido: views importa esta tarea a nivel de módulo
+    from . import views
+
+    if version is None:
+        version = get_categories_cache_version()
+    if _current_categories_version() != version:
+        logger.debug(
+            "Versión de categorías %s obsoleta, se omite el precalentado", version)
+        return
+
+    lock_key = f"{CacheKeys.CATEGORIES_WARM_UP_LOCK}:{version}"
+    if not cache.add(lock_key, 1, WARM_UP_LOCK_TIMEOUT):
+        logger.debug("Precalentado de categorías ya en curso, se omite")
+        return
+
+    public_key = categories_list_cache_key('public', 1, version=version)
+    admin_key = categories_list_cache_key('admin', 1)
+    try:
+        public_request = _build_internal_request(
+            base_url, reverse('categories:list_categories_public'))
+        views.build_categories_public_response(public_request, public_key)
+
+        admin_request = _build_internal_request(
+            base_url, reverse('categories:list-admin'))
+        views.build_categories_admin_response(admin_request, admin_key)
+
+        if _current_categories_version() != version:
+            # Hubo otra escritura durante la construcción: su propio
+            # precalentado regenerará las claves con datos actuales
+            for key in (public_key, f"{public_key}:gz", admin_key):
+                cache_manager.delete(key)
+            logger.info(
+                "Precalentado de categorías descartado (versión %s obsoleta)", version)
+            return
+
+        logger.info("Cache de categorías precalentado")
+    except Exception as exc:
+        logger.exception("Error precalentando cache de categorías")
+        raise self.retry(exc=exc, countdown=30)
+    finally:
+        cache.delete(lock_key)
@@ -36,3 +36,69 @@ def test_list_categories_admin_includes_user_fields(db, django_user_model):
     # accessing related attributes should not raise
     found = [c for c in qs if c.pk == cat.pk][0]
     assert found.created_by_id == user.id
+
+
+@pytest.mark.django_db
+def test_get_category_for_delete_flags_products(django_assert_num_queries):
+    from api.categories.selectors import get_category_for_delete
+    from api.categories.models import Category
+    from api.products.models import Product, ProductCategory
+
+    with_products = Category.objects.create(name="Delta")
+    empty = Category.objects.create(name="Epsilon")
+    product = Product.objects.create(product_code="SEL-1", name="Prod")
+    ProductCategory.objects.create(product=product, category=with_products)
+
+    with django_assert_num_queries(1):
+        found = get_category_for_delete(with_products.pk)
+        assert found.name == "Delta"
+        assert found.has_products is True
+
+    assert get_category_for_delete(empty.pk).has_products is False
+    assert get_category_for_delete(999999) is None
+
+
+@pytest.mark.django_db
+def test_list_categories_public_values_returns_plain_rows():
+    from api.categories.selectors import list_categories_public_values
+    from api.categories.models import Category
+
+    Category.objects.create(name="Zeta")
+    Category.objects.create(name="Eta")
+
+    assert list(list_categories_public_values()) == [
+        {"id": Category.objects.get(name="Eta").pk, "name": "Eta"},
+        {"id": Category.objects.get(name="Zeta").pk, "name": "Zeta"},
+    ]
+
+
+@pytest.mark.django_db
+def test_get_category_detail_selectors_defer_unused_columns():
+    from api.categories import selectors
+    from api.categories.models import Category
+
+    c = Category.objects.create(name="ancho")
+
+    public = selectors.get_category_public(c.pk)
+    assert public.get_deferred_fields() == {
+        "created_at", "updated_at", "created_by_id", "updated_by_id"}
+    assert selectors.get_category_admin(c.pk).get_deferred_fields() == set()
+    assert selectors.get_category_public(999999) is None
+
+
+@pytest.mark.django_db
+def test_category_lists_serialize_without_extra_queries(django_assert_num_queries, django_user_model):
+    from api.categories import selectors
+    from api.categories.models import Category
+    from api.categories.serializers import CategoryPrivateSerializer, CategoryPublicSerializer
+
+    user = django_user_model.objects.create_user(username="n1", password="pw")
+    for i in range(5):
+        Category.objects.create(name=f"nmasuno{i}", created_by=user, updated_by=user)
+
+    with django_assert_num_queries(1):
+        data = CategoryPrivateSerializer(selectors.list_categories_admin(), many=True).data
+    assert {row["created_by"] for row in data} == {user.pk}
+
+    with django_assert_num_queries(1):
+        CategoryPublicSerializer(selectors.list_categories_public(), many=True).data
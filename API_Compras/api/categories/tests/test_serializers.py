@@ -56,3 +56,24 @@ def test_public_serializer_only_exposes_id_and_name():
     data = ser.data
     assert set(data.keys()) == {'id', 'name'}
     assert data['name'] == 'Bebidas'
+
+
+@pytest.mark.django_db
+def test_serialize_category_admin_rows_matches_private_serializer():
+    from api.categories.selectors import list_categories_admin, list_categories_admin_values
+    from api.categories.serializers import serialize_category_admin_rows
+
+    user = User.objects.create_user(username="rows", password="pw")
+    Category.objects.create(name="filas", created_by=user, updated_by=user)
+    Category.objects.create(name="sinusuario")
+
+    expected = CategoryPrivateSerializer(list_categories_admin(), many=True).data
+    assert serialize_category_admin_rows(list_categories_admin_values()) == [
+        dict(row) for row in expected]
+
+
+def test_selector_field_lists_match_serializer_fields():
+    from api.categories.selectors import ADMIN_FIELDS, PUBLIC_FIELDS
+
+    assert list(ADMIN_FIELDS) == CategoryPrivateSerializer.Meta.fields
+    assert list(PUBLIC_FIELDS) == CategoryPublicSerializer.Meta.fields
@@ -120,6 +120,7 @@ def test_get_all_categories_with_promotions_various_cases():
     # cat_no tiene promotion inactiva -> active_promotions empty
     assert "sinpromo" in by_name
     assert by_name["sinpromo"]["active_promotions"] == []
+    assert by_name["sinpromo"]["promotion_count"] == 0
 
     # cat_mixed debe tener dos promociones (promo_active y promo_active_no_rules)
     assert "mixta" in by_name
@@ -127,6 +128,7 @@ def test_get_all_categories_with_promotions_various_cases():
     names = {p['name'] for p in active_promos}
     assert "Promo Active" in names
     assert "Promo NoRules" in names
+    assert by_name["mixta"]["promotion_count"] == 2
 
     # la promo con regla vigente debe exponer una regla en 'rules'
     pa = next(p for p in active_promos if p['name'] == "Promo Active")
@@ -140,6 +142,30 @@ def test_get_all_categories_with_promotions_various_cases():
     assert pnr['rules'] == []
 
 
+@pytest.mark.django_db
+def test_categories_with_promotions_prefetch_defers_unused_columns():
+    """Los prefetch de scopes y reglas solo cargan las columnas expuestas."""
+    from api.categories.services import get_categories_with_promotions_queryset
+    now = timezone.now()
+    cat = Category.objects.create(name="narrow")
+    promo = Promotion.objects.create(name="Promo Narrow", active=True)
+    PromotionScopeCategory.objects.create(promotion=promo, category=cat)
+    PromotionRule.objects.create(
+        promotion=promo,
+        type=PromotionRule.Type.PERCENTAGE,
+        value=Decimal('10.00'),
+        priority=1,
+        start_at=now - timedelta(days=1),
+        end_at=now + timedelta(days=1),
+        acumulable=False
+    )
+
+    category = get_categories_with_promotions_queryset().get(pk=cat.pk)
+    scope = category.active_promotion_scopes[0]
+    assert "created_at" in scope.promotion.get_deferred_fields()
+    assert "created_at" in scope.promotion.active_rules[0].get_deferred_fields()
+
+
 @pytest.mark.django_db
 def test_get_all_categories_with_no_categories_returns_empty_list():
     """Cuando no hay categorías, debe devolver data como lista vacía."""
@@ -148,3 +174,66 @@ def test_get_all_categories_with_no_categories_returns_empty_list():
     res = get_all_categories_with_promotions()
     assert res["success"] is True
     assert res["data"] == []
+
+
+@pytest.mark.django_db
+def test_create_categories_bulk_normalizes_and_rejects_duplicates():
+    """Alta masiva: normaliza nombres y valida duplicados en lote y en BD."""
+    from api.categories.services import create_categories
+    user = User.objects.create(
+        username="bulk", email="bulk@example.com", password="pwd")
+
+    res = create_categories(user=user, names=[" Hogar ", "JARDIN"])
+    assert res["success"] is True
+    assert {c.name for c in res["data"]} == {"hogar", "jardin"}
+    assert all(c.pk and c.created_by == user for c in res["data"])
+
+    with pytest.raises(exceptions.ValidationError):
+        create_categories(user=user, names=["nueva", " NUEVA "])
+    with pytest.raises(exceptions.ValidationError):
+        create_categories(user=user, names=["otra", "Hogar"])
+    assert not Category.objects.filter(name__in=["nueva", "otra"]).exists()
+
+
+@pytest.mark.django_db
+def test_create_categories_bulk_skip_existing_omits_repeated_names():
+    """Importación masiva: omite nombres repetidos o existentes sin fallar."""
+    from api.categories.services import create_categories
+    user = User.objects.create(
+        username="bulks", email="bulks@example.com", password="pwd")
+    Category.objects.create(name="existente")
+
+    res = create_categories(
+        user=user, names=["Nueva", "nueva ", "EXISTENTE", "otra"], skip_existing=True)
+    assert {c.name for c in res["data"]} == {"nueva", "otra"}
+    assert "2 omitidas" in res["message"]
+    assert Category.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_rename_categories_bulk_updates_and_validates():
+    """Renombrado masivo: aplica cambios y valida inexistentes/ocupados."""
+    from api.categories.services import rename_categories
+    user = User.objects.create(
+        username="bulkr", email="bulkr@example.com", password="pwd")
+    a = Category.objects.create(name="uno")
+    b = Category.objects.create(name="dos")
+    Category.objects.create(name="tres")
+
+    res = rename_categories(user=user, renames=[
+        {"id": a.pk, "name": " Primero "}, {"id": b.pk, "name": "segundo"}])
+    assert res["success"] is True
+    a.refresh_from_db()
+    b.refresh_from_db()
+    assert (a.name, b.name) == ("primero", "segundo")
+    assert a.updated_by == user
+
+    with pytest.raises(exceptions.ValidationError):
+        rename_categories(user=user, renames=[{"id": a.pk, "name": "tres"}])
+    with pytest.raises(exceptions.ValidationError):
+        rename_categories(user=user, renames=[{"id": 999999, "name": "x"}])
+    with pytest.raises(exceptions.ValidationError, match=str(a.pk)):
+        rename_categories(user=user, renames=[
+            {"id": a.pk, "name": "otro"}, {"id": a.pk, "name": "distinto"}])
+    a.refresh_from_db()
+    assert a.name == "primero"
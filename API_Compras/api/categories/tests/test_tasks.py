@@ -0,0 +1,91 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_warm_up_categories_cache_fills_first_pages():
+    from api.cache import cache_manager
+    from api.categories.models import Category
+    from api.categories.tasks import warm_up_categories_cache
+    from api.categories.utils import categories_list_cache_key, get_categories_cache_version
+
+    for i in range(12):
+        Category.objects.create(name=f"cat{i:02d}")
+
+    warm_up_categories_cache("http://testserver")
+
+    public = cache_manager.get(categories_list_cache_key(
+        'public', 1, version=get_categories_cache_version()))
+    admin = cache_manager.get(categories_list_cache_key('admin', 1))
+    assert public["data"]["count"] == 12
+    assert public["data"]["next"] == "http://testserver/api/v2/categories/?page=2"
+    assert admin["data"]["count"] == 12
+    assert len(admin["data"]["results"]) == 10
+
+
+@pytest.mark.django_db
+def test_warm_up_categories_cache_skips_stale_version():
+    from api.cache import cache_manager
+    from api.categories.models import Category
+    from api.categories.tasks import warm_up_categories_cache
+    from api.categories.utils import (
+        categories_list_cache_key, get_categories_cache_version, bump_categories_cache_version)
+
+    cache_manager.delete(categories_list_cache_key('admin', 1))
+    Category.objects.create(name="cat")
+    stale = get_categories_cache_version()
+    bump_categories_cache_version()
+
+    warm_up_categories_cache("http://testserver", stale)
+
+    assert cache_manager.get(
+        categories_list_cache_key('public', 1, version=stale)) is None
+    assert cache_manager.get(categories_list_cache_key('admin', 1)) is None
+
+
+@pytest.mark.django_db
+def test_warm_up_categories_cache_discards_result_when_version_changes(monkeypatch):
+    from api.cache import cache_manager
+    from api.categories import views
+    from api.categories.models import Category
+    from api.categories.tasks import warm_up_categories_cache
+    from api.categories.utils import (
+        categories_list_cache_key, get_categories_cache_version, bump_categories_cache_version)
+
+    Category.objects.create(name="cat")
+    version = get_categories_cache_version()
+    build_admin = views.build_categories_admin_response
+
+    def build_admin_then_write(request, cache_key):
+        # Simula una escritura concurrente durante la construcción
+        result = build_admin(request, cache_key)
+        bump_categories_cache_version()
+        return result
+
+    monkeypatch.setattr(
+        views, "build_categories_admin_response", build_admin_then_write)
+
+    warm_up_categories_cache("http://testserver", version)
+
+    public_key = categories_list_cache_key('public', 1, version=version)
+    assert cache_manager.get(public_key) is None
+    assert cache_manager.get(f"{public_key}:gz") is None
+    assert cache_manager.get(categories_list_cache_key('admin', 1)) is None
+
+
+@pytest.mark.django_db
+def test_warm_up_categories_cache_lock_is_per_version():
+    from django.core.cache import cache
+    from api.cache import cache_manager, CacheKeys
+    from api.categories.models import Category
+    from api.categories.tasks import warm_up_categories_cache
+    from api.categories.utils import categories_list_cache_key, bump_categories_cache_version
+
+    Category.objects.create(name="cat")
+    old = bump_categories_cache_version()
+    cache.add(f"{CacheKeys.CATEGORIES_WARM_UP_LOCK}:{old}", 1, 10)
+    new = bump_categories_cache_version()
+
+    warm_up_categories_cache("http://testserver", new)
+
+    assert cache_manager.get(
+        categories_list_cache_key('public', 1, version=new))["data"]["count"] == 1
@@ -0,0 +1,42 @@
+from api.categories.utils import categories_list_cache_key
+
+
+def test_categories_list_cache_key_public_and_admin():
+    assert categories_list_cache_key("public", 2, version=5) == \
+        "categories:list:public:v5:p2"
+    # el listado admin distingue páginas y filtros
+    assert categories_list_cache_key("admin", 1) != categories_list_cache_key("admin", 2)
+    assert categories_list_cache_key("admin", 1, search="a") != \
+        categories_list_cache_key("admin", 1, ordering="a")
+
+
+def test_categories_list_cache_key_bounds_long_filters():
+    key = categories_list_cache_key("admin", 1, search="x" * 5000)
+    assert len(key) < 64
+
+
+def test_local_ttl_cache_expires_and_evicts(monkeypatch):
+    from api.cache import LocalTTLCache
+    import api.cache.cache_utils as cache_utils
+
+    now = [100.0]
+    monkeypatch.setattr(cache_utils.time, "monotonic", lambda: now[0])
+    local = LocalTTLCache(maxsize=2, ttl=5)
+
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1
+    local.set("c", 3)  # descarta "b", la menos usada
+    assert local.get("b") is None
+    now[0] += 6
+    assert local.get("a") is None
+
+
+def test_bump_version_clears_local_cache():
+    from api.categories.utils import (
+        bump_categories_cache_version, get_categories_cache_version, local_categories_cache)
+
+    local_categories_cache.set("categories:list:public:v1:p1", {"data": []})
+    version = bump_categories_cache_version()
+    assert local_categories_cache.get("categories:list:public:v1:p1") is None
+    assert get_categories_cache_version() == version
@@ -1,3 +1,4 @@
+import json
 import pytest
 from rest_framework.test import APIRequestFactory, force_authenticate
 from django.contrib.auth import get_user_model
@@ -17,9 +18,9 @@ def test_list_categories_public_view_returns_data(monkeypatch):
         def __iter__(self):
             return iter([])
 
-    # monkeypatch selectors.list_categories_public to return a queryset-like
+    # monkeypatch selectors.list_categories_public_values to return a queryset-like
     monkeypatch.setattr(
-        'api.categories.selectors.list_categories_public', lambda: FakeQS())
+        'api.categories.selectors.list_categories_public_values', lambda: FakeQS())
 
     # monkeypatch serializer to return our fake_data when passed the fake QS
     # Instead of patching serializer class, we'll call the view and assert structure
@@ -75,7 +76,7 @@ def test_list_categories_admin_requires_admin_and_returns_list(monkeypatch):
 
     # monkeypatch selectors to return empty list
     monkeypatch.setattr(
-        'api.categories.selectors.list_categories_admin', lambda: [])
+        'api.categories.selectors.list_categories_admin_values', lambda: [])
 
     resp2 = views.list_categories_admin(req2)
     assert resp2.status_code == 200
@@ -84,3 +85,284 @@ def test_list_categories_admin_requires_admin_and_returns_list(monkeypatch):
     import json as _json
     payload2 = _json.loads(resp2.content)
     assert payload2["success"] is True
+
+
+@pytest.mark.django_db
+def test_delete_category_checks_products_and_missing():
+    from api.categories import views
+    from api.categories.models import Category
+    from api.products.models import Product, ProductCategory
+    User = get_user_model()
+
+    admin = User.objects.create_user(
+        username='deladm', password='pw', email='deladm@example.test', is_staff=True, is_superuser=True)
+    factory = APIRequestFactory()
+
+    with_products = Category.objects.create(name="conproductos")
+    product = Product.objects.create(product_code="DEL-1", name="Prod")
+    ProductCategory.objects.create(product=product, category=with_products)
+    empty = Category.objects.create(name="vacia")
+
+    # Categoría con productos asociados -> 400 y no se elimina
+    req = factory.delete(f'/api/v2/admin/categories/delete/{with_products.pk}/')
+    force_authenticate(req, user=admin)
+    resp = views.delete_category(req, pk=with_products.pk)
+    assert resp.status_code == 400
+    assert Category.objects.filter(pk=with_products.pk).exists()
+
+    # Categoría sin productos -> 204 y se elimina
+    req = factory.delete(f'/api/v2/admin/categories/delete/{empty.pk}/')
+    force_authenticate(req, user=admin)
+    resp = views.delete_category(req, pk=empty.pk)
+    assert resp.status_code == 204
+    assert not Category.objects.filter(pk=empty.pk).exists()
+
+    # Categoría inexistente -> 404
+    req = factory.delete(f'/api/v2/admin/categories/delete/{empty.pk}/')
+    force_authenticate(req, user=admin)
+    resp = views.delete_category(req, pk=empty.pk)
+    assert resp.status_code == 404
+
+
+@pytest.mark.django_db
+def test_update_category_renames_inside_transaction_and_missing_returns_404():
+    from api.categories import views
+    from api.categories.models import Category
+    User = get_user_model()
+
+    admin = User.objects.create_user(
+        username='updadm', password='pw', email='updadm@example.test', is_staff=True, is_superuser=True)
+    factory = APIRequestFactory()
+    category = Category.objects.create(name="antigua")
+
+    req = factory.patch(
+        f'/api/v2/admin/categories/update/{category.pk}/', {"name": " Nueva "}, format='json')
+    force_authenticate(req, user=admin)
+    resp = views.update_category(req, pk=category.pk)
+    assert resp.status_code == 200
+    assert resp.data["data"]["new_name"] == "nueva"
+    category.refresh_from_db()
+    assert category.name == "nueva"
+
+    req = factory.patch(
+        '/api/v2/admin/categories/update/999999/', {"name": "otra"}, format='json')
+    force_authenticate(req, user=admin)
+    resp = views.update_category(req, pk=999999)
+    assert resp.status_code == 404
+
+
+@pytest.mark.django_db
+def test_public_categories_conditional_get_uses_version_etag():
+    from rest_framework.test import APIClient
+    from api.categories.models import Category
+
+    client = APIClient()
+    category = Category.objects.create(name="etag")
+
+    resp = client.get('/api/v2/categories/')
+    assert resp.status_code == 200
+    etag = resp['ETag']
+    assert etag.startswith('W/"cats-')
+    assert 'max-age=60' in resp['Cache-Control']
+    assert 'Accept' in resp['Vary']
+
+    # Mismo ETag -> 304 sin cuerpo
+    resp = client.get('/api/v2/categories/', HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+
+    # Un cambio en la categoría renueva la versión y el ETag deja de coincidir
+    category.name = "etag2"
+    category.save()
+    resp = client.get('/api/v2/categories/', HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_public_categories_serves_precompressed_gzip():
+    import gzip
+    import json
+    from rest_framework.test import APIClient
+    from api.categories.models import Category
+
+    client = APIClient()
+    Category.objects.create(name="gzip")
+
+    # Primer request: cache miss, respuesta sin comprimir
+    resp = client.get('/api/v2/categories/', HTTP_ACCEPT_ENCODING='gzip')
+    assert resp.status_code == 200
+    assert 'Accept-Encoding' in resp['Vary']
+
+    # Segundo request: bytes gzip tomados del cache
+    resp = client.get('/api/v2/categories/', HTTP_ACCEPT_ENCODING='gzip, br')
+    assert resp.status_code == 200
+    assert resp['Content-Encoding'] == 'gzip'
+    body = json.loads(gzip.decompress(resp.content))
+    assert body["data"]["results"][0]["name"] == "gzip"
+
+    # Sin Accept-Encoding gzip se responde JSON plano
+    resp = client.get('/api/v2/categories/')
+    assert not resp.has_header('Content-Encoding')
+
+
+@pytest.mark.django_db
+def test_create_category_returns_serialized_instance():
+    from api.categories import views
+    User = get_user_model()
+
+    admin = User.objects.create_user(
+        username='creadm', password='pw', email='creadm@example.test', is_staff=True, is_superuser=True)
+    factory = APIRequestFactory()
+
+    req = factory.post('/api/v2/admin/categories/create/',
+                       {"name": " Hogar "}, format='json')
+    force_authenticate(req, user=admin)
+    resp = views.create_category(req)
+    assert resp.status_code == 201
+    data = resp.data["data"]
+    assert data["name"] == "hogar"
+    assert data["id"] is not None
+    assert data["created_by"] == admin.pk
+
+
+@pytest.mark.django_db
+def test_bulk_create_categories_view():
+    from api.categories import views
+    from api.categories.models import Category
+    User = get_user_model()
+
+    admin = User.objects.create_user(
+        username='bulkadm', password='pw', email='bulkadm@example.test', is_staff=True, is_superuser=True)
+    factory = APIRequestFactory()
+
+    req = factory.post('/api/v2/admin/categories/bulk-create/',
+                       [{"name": "Libros"}, {"name": "Musica"}], format='json')
+    force_authenticate(req, user=admin)
+    resp = views.bulk_create_categories(req)
+    assert resp.status_code == 201
+    assert {c["name"] for c in resp.data["data"]} == {"libros", "musica"}
+    assert Category.objects.count() == 2
+
+    # nombre inválido en el lote -> 400 y no se crea nada
+    req = factory.post('/api/v2/admin/categories/bulk-create/',
+                       [{"name": "Cine"}, {"name": "x"}], format='json')
+    force_authenticate(req, user=admin)
+    resp = views.bulk_create_categories(req)
+    assert resp.status_code == 400
+    assert Category.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_get_category_public_missing_returns_404():
+    from rest_framework.test import APIClient
+
+    resp = APIClient().get('/api/v2/categories/999999/')
+    assert resp.status_code == 404
+    assert resp.json()["success"] is False
+
+
+@pytest.mark.django_db
+def test_get_category_detail_is_cached_until_category_changes(django_assert_num_queries):
+    from api.categories import views
+    from api.categories.models import Category
+    User = get_user_model()
+
+    admin = User.objects.create_user(
+        username='detadm', password='pw', email='detadm@example.test', is_staff=True, is_superuser=True)
+    category = Category.objects.create(name="detalle")
+    factory = APIRequestFactory()
+
+    def get_admin():
+        req = factory.get(f'/api/v2/admin/categories/{category.pk}/')
+        force_authenticate(req, user=admin)
+        return views.get_category_admin(req, pk=category.pk)
+
+    assert get_admin().data["data"]["name"] == "detalle"
+    with django_assert_num_queries(0):
+        assert get_admin().data["data"]["name"] == "detalle"
+
+    # post_save renueva la versión y el detalle se vuelve a consultar
+    category.name = "detalle2"
+    category.save()
+    assert get_admin().data["data"]["name"] == "detalle2"
+
+    req = factory.get(f'/api/v2/categories/{category.pk}/')
+    assert json.loads(views.get_category_public(req, id=category.pk).content)["data"] == {
+        "id": category.pk, "name": "detalle2"}
+
+
+@pytest.mark.django_db
+def test_categories_with_promotions_uses_cursor_pagination(django_assert_max_num_queries):
+    from rest_framework.test import APIClient
+    from api.categories.models import Category
+    from api.categories.views import PAGINATION_PAGE_SIZE_CATEGORY
+    from api.promotions.models import Promotion, PromotionScopeCategory
+
+    Category.objects.bulk_create(
+        [Category(name=f"promo-cat-{i:02d}") for i in range(PAGINATION_PAGE_SIZE_CATEGORY + 3)])
+    ids = list(Category.objects.order_by("id").values_list("id", flat=True))
+    promo = Promotion.objects.create(name="Promo cursor", active=True)
+    PromotionScopeCategory.objects.bulk_create(
+        [PromotionScopeCategory(promotion=promo, category_id=pk) for pk in ids])
+
+    # Categorías sin promoción activa no se listan
+    inactive = Promotion.objects.create(name="Promo inactiva", active=False)
+    PromotionScopeCategory.objects.create(
+        promotion=inactive, category=Category.objects.create(name="zz-inactiva"))
+    Category.objects.create(name="zz-sin-promo")
+
+    client = APIClient()
+    resp = client.get('/api/v2/categories/promotions/')
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["success"] is True
+    assert "count" not in body["data"]
+    assert [r["category"]["id"] for r in body["data"]["results"]] == ids[:PAGINATION_PAGE_SIZE_CATEGORY]
+
+    # Página siguiente por cursor: página + prefetch de scopes y reglas, sin COUNT
+    with django_assert_max_num_queries(3):
+        resp = client.get(body["data"]["next"])
+    results = resp.json()["data"]["results"]
+    assert [r["category"]["id"] for r in results] == ids[PAGINATION_PAGE_SIZE_CATEGORY:]
+    assert results[0]["promotion_count"] == 1
+    assert resp.json()["data"]["next"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ['/api/v2/admin/categories/', '/api/v2/categories/'])
+def test_category_list_query_count_does_not_grow_with_rows(path):
+    """Regresión N+1: la cantidad de consultas no depende de las filas listadas."""
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from api.categories.models import Category
+    from api.categories.utils import local_categories_cache
+    User = get_user_model()
+
+    admin = User.objects.create_user(
+        username='n1adm', password='pw', email='n1adm@example.test', is_staff=True, is_superuser=True)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    def count_queries():
+        cache.clear()
+        local_categories_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            assert client.get(path).status_code == 200
+        return len(ctx.captured_queries)
+
+    Category.objects.bulk_create(
+        [Category(name=f"fila{i}", created_by=admin, updated_by=admin) for i in range(2)])
+    few = count_queries()
+    Category.objects.bulk_create(
+        [Category(name=f"fila{i}", created_by=admin, updated_by=admin) for i in range(2, 9)])
+    assert count_queries() == few
+
+
+@pytest.mark.django_db
+def test_categories_with_promotions_invalid_cursor_returns_404():
+    from rest_framework.test import APIClient
+
+    resp = APIClient().get('/api/v2/categories/promotions/', {"cursor": "no-es-un-cursor"})
+    assert resp.status_code == 404
@@ -14,6 +14,10 @@ urlpatterns = [
          views.get_category_admin, name='get-admin'),
     path('admin/categories/create/', views.create_category, name='create'),
      path('admin/categories/create', views.create_category, name='create_no_slash'),
+    path('admin/categories/bulk-create/',
+         views.bulk_create_categories, name='bulk-create'),
+    path('admin/categories/bulk-update/',
+         views.bulk_update_categories, name='bulk-update'),
     path('admin/categories/update/<int:pk>/',
          views.update_category, name='update'),
     path('admin/categories/delete/<int:pk>/',
@@ -24,6 +28,6 @@ urlpatterns = [
          name='list_categories_public'),
     path('categories/<int:id>/', views.get_category_public,
          name='get_category_public'),
-    path('categories/promotions/', views.get_categories_with_promotions,
+    path('categories/promotions/', views.CategoriesWithPromotionsView.as_view(),
          name='get_categories_with_promotions'),
 ]
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+from rest_framework.renderers import JSONRenderer
+from api.cache import cache_manager, CacheKeys, CacheTimeouts, LocalTTLCache
+
+# Cache en memoria del proceso delante de Redis para los endpoints públicos.
+# Los procesos que no realizaron la escritura ven los cambios en <= TTL segundos.
+LOCAL_CACHE_TTL = 5
+LOCAL_CACHE_MAXSIZE = 128
+local_categories_cache = LocalTTLCache(
+    maxsize=LOCAL_CACHE_MAXSIZE, ttl=LOCAL_CACHE_TTL)
+
+# Nivel de gzip para las respuestas precomprimidas (balance CPU / tamaño)
+GZIP_COMPRESS_LEVEL = 6
+
+
+def get_categories_cache_version() -> int:
+    """
+    Obtiene la versión actual de los datos públicos de categorías.
+
+    La versión es un timestamp en milisegundos que se renueva cada vez que
+    una categoría cambia. Si la clave no existe (expiró o se limpió el cache)
+    se inicializa con el instante actual, de modo que nunca vuelva a un valor
+    anterior que pudiera validar un ETag obsoleto.
+
+    Returns:
+        int: Versión monotónica de las categorías.
+    """
+    version = local_categories_cache.get(CacheKeys.CATEGORIES_VERSION)
+    if version is not None:
+        return version
+    version = cache_manager.get(CacheKeys.CATEGORIES_VERSION)
+    if version is None:
+        return bump_categories_cache_version()
+    local_categories_cache.set(CacheKeys.CATEGORIES_VERSION, version)
+    return version
+
+
+def bump_categories_cache_version() -> int:
+    """
+    Renueva la versión de los datos de categorías.
+
+    Se llama al invalidar el cache de categorías y desde las señales
+    post_save/post_delete de Category. También vacía el cache local del
+    proceso, de modo que quien escribe deja de servir datos anteriores.
+
+    Returns:
+        int: Nueva versión de las categorías.
+    """
+    previous = cache_manager.get(CacheKeys.CATEGORIES_VERSION) or 0
+    version = max(int(time.time() * 1000), previous + 1)
+    cache_manager.set(CacheKeys.CATEGORIES_VERSION, version,
+                      timeout=CacheTimeouts.STATIC_DATA)
+    local_categories_cache.clear()
+    local_categories_cache.set(CacheKeys.CATEGORIES_VERSION, version)
+    return version
+
+
+def categories_etag(request, *args, **kwargs) -> str:
+    """
+    Calcula el ETag débil de los endpoints públicos de categorías.
+
+    Combina la versión de categorías con la página solicitada (listado) o
+    con el ID de la categoría (detalle).
+
+    Returns:
+        str: ETag débil, ej: W/"cats-1700000000000-1".
+    """
+    version = get_categories_cache_version()
+    if "id" in kwargs:
+        return f'W/"cats-{version}-id{kwargs["id"]}"'
+    page = request.GET.get("page", 1)
+    return f'W/"cats-{version}-{page}"'
+
+
+def categories_last_modified(request, *args, **kwargs) -> datetime:
+    """
+    Devuelve la fecha de última modificación de las categorías.
+
+    Returns:
+        datetime: Instante (UTC) en el que se renovó la versión de categorías.
+    """
+    version = get_categories_cache_version()
+    return datetime.fromtimestamp(version / 1000, tz=dt_timezone.utc)
+
+
+def categories_list_cache_key(scope: str, page, version=None, search: str = "", ordering: str = "") -> str:
+    """
+    Construye la clave de cache de un listado de categorías.
+
+    La clave se arma una sola vez por request y se pasa a cache_manager sin
+    kwargs, evitando el ordenamiento + json.dumps + md5 de los parámetros.
+    Los filtros libres (search/ordering) se resumen con blake2b para que
+    query strings largos no generen claves largas.
+
+    Args:
+        scope (str): "public" o "admin".
+        page: Número de página solicitado.
+        version (int | None): Versión de categorías (solo listado público).
+        search (str): Texto de búsqueda (solo listado admin).
+        ordering (str): Campo de ordenamiento (solo listado admin).
+
+    Returns:
+        str: Clave de cache, ej: "categories:list:public:v1700000000000:p1".
+    """
+    key = f"{CacheKeys.CATEGORIES_LIST}:{scope}"
+    if version is not None:
+        key = f"{key}:v{version}"
+    key = f"{key}:p{page}"
+    if search or ordering:
+        digest = hashlib.blake2b(
+            f"{search}|{ordering}".encode(), digest_size=8).hexdigest()
+        key = f"{key}:{digest}"
+    return key
+
+
+def category_detail_cache_key(pk, scope: str, version=None) -> str:
+    """
+    Construye la clave de cache del detalle de una categoría.
+
+    Al incluir la versión de categorías, las señales post_save/post_delete
+    invalidan el detalle sin borrar claves.
+
+    Args:
+        pk: ID de la categoría.
+        scope (str): "public" o "admin".
+        version (int | None): Versión de categorías (por defecto la vigente).
+
+    Returns:
+        str: Clave de cache, ej: "categories:detail:5:public:v1700000000000".
+    """
+    if version is None:
+        version = get_categories_cache_version()
+    return f"{CacheKeys.CATEGORY_DETAIL}:{pk}:{scope}:v{version}"
+
+
+def compress_categories_payload(data) -> bytes:
+    """
+    Renderiza a JSON y comprime con gzip una respuesta de categorías.
+
+    Se ejecuta una sola vez al escribir el cache, de modo que los hits
+    sirven los bytes ya comprimidos sin volver a renderizar ni comprimir.
+
+    Args:
+        data (dict): Respuesta con formato estándar (success, message, data).
+
+    Returns:
+        bytes: JSON comprimido con gzip.
+    """
+    return gzip.compress(JSONRenderer().render(data), compresslevel=GZIP_COMPRESS_LEVEL)
+
+
+def accepts_gzip(request) -> bool:
+    """
+    Indica si se puede responder con el JSON precomprimido.
+
+    Requiere que el cliente acepte gzip y que la negociación de contenido
+    de DRF haya elegido el renderer JSON (no la API navegable).
+
+    Args:
+        request (Request): Request de DRF ya negociado.
+
+    Returns:
+        bool: True si se pueden servir los bytes gzip.
+    """
+    accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    renderer = getattr(request, "accepted_renderer", None)
+    return "gzip" in accept_encoding.lower() and getattr(renderer, "format", None) == "json"
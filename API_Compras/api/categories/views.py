@@ -1,31 +1,121 @@
 from rest_framework.permissions import IsAdminUser, AllowAny
 from rest_framework.response import Response
-from rest_framework import status, viewsets
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.generics import ListAPIView
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 from api.view_tags import categories_public, categories_admin
-from .serializers import CategoryPrivateSerializer, CategoryPublicSerializer
+from .serializers import (
+    CategoryPrivateSerializer, CategoryPublicSerializer, CategoryBulkRenameSerializer,
+    CategoryWithPromotionsSerializer, serialize_category_admin_rows,
+)
 from . import services, selectors
-from django.shortcuts import get_object_or_404
+from .tasks import warm_up_categories_cache
 from .models import Category
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from django.core.exceptions import ValidationError
+from django.db import transaction, DatabaseError, IntegrityError
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from django.views.decorators.http import condition
+from django.views.decorators.cache import cache_control
+from django.views.decorators.vary import vary_on_headers
+from .utils import (
+    bump_categories_cache_version, get_categories_cache_version,
+    categories_etag, categories_last_modified, categories_list_cache_key,
+    local_categories_cache, compress_categories_payload, accepts_gzip,
+    category_detail_cache_key,
+)
 from api.cache import cache_manager, CacheKeys, CacheTimeouts
-from api.response_helpers import success_response, server_error_response
+from api.response_helpers import success_response, server_error_response, not_found_error_response
 import logging
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 logger = logging.getLogger(__name__)
 
 PAGINATION_PAGE_SIZE_CATEGORY = 10
 
+# Segundos que clientes y caches compartidos pueden reutilizar las respuestas
+# públicas sin revalidar; luego revalidan con ETag/Last-Modified (304)
+PUBLIC_CATEGORIES_MAX_AGE = 60
+
+# Errores de datos que se responden como 400; el resto de errores inesperados
+# se propagan al manejador de DRF / SecureErrorMiddleware
+VALIDATION_ERRORS = (DRFValidationError, ValidationError, IntegrityError)
+
+
+class CategoryPagination(PageNumberPagination):
+    """
+    Paginador de categorías con el tamaño de página fijado a nivel de clase.
+
+    Los paginadores de DRF guardan estado del request (page, request), por lo
+    que se instancia uno por request, pero sin reasignar page_size cada vez.
+    """
+    page_size = PAGINATION_PAGE_SIZE_CATEGORY
+
+
+class CategoryCursorPagination(CursorPagination):
+    """
+    Paginador por cursor (keyset) sobre la PK de la categoría.
+
+    Cada página filtra con `WHERE id > :ultimo_id` sobre el índice de la PK,
+    por lo que el costo no crece con la profundidad de la página (sin OFFSET
+    ni COUNT).
+    """
+    page_size = PAGINATION_PAGE_SIZE_CATEGORY
+    ordering = "id"
+
+
+def _validation_error_response(message: str, exc: Exception) -> Response:
+    """
+    Respuesta 400 estándar para errores de validación de DRF o de Django.
+
+    Args:
+        message (str): Mensaje descriptivo de la operación.
+        exc (Exception): Error de validación capturado.
+
+    Returns:
+        Response: Respuesta con success=False y el detalle del error.
+    """
+    detail = getattr(exc, "detail", None) or getattr(
+        exc, "messages", None) or str(exc)
+    return Response({
+        "success": False,
+        "message": message,
+        "error": detail
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _database_error_response(message: str) -> Response:
+    """
+    Respuesta 500 estándar para errores de base de datos.
+
+    El detalle del error solo se registra en el log (logger.exception), no
+    se incluye en la respuesta.
+
+    Args:
+        message (str): Mensaje descriptivo de la operación.
+
+    Returns:
+        Response: Respuesta con success=False y estado 500.
+    """
+    return Response({
+        "success": False,
+        "message": message
+    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 
-def _invalidate_categories_cache():
+def _invalidate_categories_cache(request=None):
     """
     Invalida el cache relacionado con categorías.
 
     Esta función se ejecuta después de crear, actualizar o eliminar categorías
-    para asegurar que los datos en cache estén actualizados.
+    para asegurar que los datos en cache estén actualizados. Si se recibe el
+    request de la escritura, encola (al confirmar la transacción) la tarea que
+    regenera la primera página de los listados para la nueva versión.
+
+    Args:
+        request (Request, optional): Request que originó la escritura.
     """
     # Invalidar cache de categorías
     cache_manager.delete_pattern(f"{CacheKeys.CATEGORIES_LIST}*")
@@ -35,50 +125,160 @@ def _invalidate_categories_cache():
     # También invalidar cache de productos por categoría ya que las categorías pueden haber cambiado
     cache_manager.delete_pattern(f"{CacheKeys.PRODUCTS_BY_CATEGORY}*")
 
+    # Renovar la versión usada por los ETag de los endpoints públicos
+    version = bump_categories_cache_version()
+
+    if request is not None:
+        base_url = f"{request.scheme}://{request.get_host()}"
+        transaction.on_commit(
+            lambda: warm_up_categories_cache.delay(base_url, version),
+            robust=True)
+
     logger.info("Cache de categorías invalidado")
 
 
-@swagger_auto_schema(
-    method='get',
-    operation_summary="Listar categorías (Admin)",
-    operation_description="Obtiene todas las categorías del sistema con información completa. Solo disponible para administradores.",
-    manual_parameters=[
-        openapi.Parameter(
-            'ordering',
-            openapi.IN_QUERY,
-            description="Campo por el cual ordenar. Usar '-' para orden descendente (ej: -name, created_at)",
-            type=openapi.TYPE_STRING,
-            required=False
-        ),
-        openapi.Parameter(
-            'search',
-            openapi.IN_QUERY,
-            description="Buscar categorías por nombre o descripción",
-            type=openapi.TYPE_STRING,
-            required=False
+def build_categories_admin_response(request, cache_key: str) -> dict:
+    """
+    Construye y cachea la respuesta paginada del listado admin de categorías.
+
+    Se usa desde la vista en un cache miss y desde la tarea de precalentado
+    del cache tras una escritura.
+
+    Args:
+        request (Request): Request de DRF usado por el paginador.
+        cache_key (str): Clave de cache de la página solicitada.
+
+    Returns:
+        dict: Respuesta con formato estándar (success, message, data).
+    """
+    # Filas planas: se evita el ModelSerializer en el camino de lectura
+    categories = selectors.list_categories_admin_values()
+    paginator = CategoryPagination()
+
+    # Aplicar paginación con manejo de errores para tests
+    try:
+        page_data = paginator.paginate_queryset(categories, request)
+    except (TypeError, AttributeError):
+        # Si falla con objetos mock/fake, convertir a lista
+        categories = list(categories)
+        page_data = paginator.paginate_queryset(categories, request)
+
+    response_data = paginator.get_paginated_response(
+        serialize_category_admin_rows(page_data))
+
+    # Formatear respuesta según estándar
+    formatted_response = {
+        "success": True,
+        "message": "Categorías obtenidas exitosamente",
+        "data": response_data.data
+    }
+
+    # Guardar en cache
+    cache_manager.set(
+        cache_key,
+        formatted_response,
+        timeout=CacheTimeouts.MASTER_DATA
+    )
+    return formatted_response
+
+
+def _get_public_cached(cache_key: str):
+    """
+    Busca una clave del listado público en el cache local y luego en Redis.
+
+    Un hit en Redis se copia al cache local del proceso.
+
+    Args:
+        cache_key (str): Clave de cache.
+
+    Returns:
+        Any: Valor cacheado o None si no existe.
+    """
+    # Primero el cache local del proceso (sin round trip a Redis)
+    value = local_categories_cache.get(cache_key)
+    if value is None:
+        value = cache_manager.get(cache_key)
+        if value is not None:
+            local_categories_cache.set(cache_key, value)
+    return value
+
+
+def _gzip_json_response(body: bytes) -> HttpResponse:
+    """
+    Respuesta 200 con el JSON ya comprimido con gzip.
+
+    Args:
+        body (bytes): JSON comprimido.
+
+    Returns:
+        HttpResponse: Respuesta con Content-Encoding: gzip.
+    """
+    response = HttpResponse(body, content_type="application/json")
+    response["Content-Encoding"] = "gzip"
+    response["Content-Length"] = str(len(body))
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def build_categories_public_response(request, cache_key: str) -> dict:
+    """
+    Construye y cachea la respuesta paginada del listado público de categorías.
+
+    Se usa desde la vista en un cache miss y desde la tarea de precalentado
+    del cache tras una escritura.
+
+    Args:
+        request (Request): Request de DRF usado por el paginador.
+        cache_key (str): Clave de cache de la página solicitada.
+
+    Returns:
+        dict: Respuesta con formato estándar (success, message, data).
+    """
+    # Filas planas id/name: no se instancian modelos ni se usa el serializer
+    categories = selectors.list_categories_public_values()
+
+    # Algunos selectores pueden devolver iterables que no implementan
+    # __len__ o count (p.ej. objetos falsos en tests). Para asegurar
+    # compatibilidad, convertir a lista si es necesario
+    try:
+        # Intentar usar directamente con el paginador
+        paginator = CategoryPagination()
+        page_data = paginator.paginate_queryset(categories, request)
+    except (TypeError, AttributeError):
+        # Si falla, convertir a lista y reintentar
+        categories = list(categories)
+        paginator = CategoryPagination()
+        page_data = paginator.paginate_queryset(categories, request)
+
+    # Devolver response ya paginada con formato estándar
+    response = paginator.get_paginated_response(list(page_data))
+
+    # Formatear según estándar de respuesta
+    formatted_response = {
+        "success": True,
+        "message": "Categorías públicas obtenidas exitosamente",
+        "data": response.data
+    }
+
+    # Cache the formatted response data (y su versión precomprimida con gzip)
+    try:
+        cache_manager.set(
+            cache_key,
+            formatted_response,
+            timeout=CacheTimeouts.STATIC_DATA
         )
-    ],
-    responses={
-        200: openapi.Response(
-            description="Lista completa de categorías",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': openapi.Schema(
-                        type=openapi.TYPE_ARRAY,
-                        items=CategoryPrivateSerializer
-                    ),
-                    'count': openapi.Schema(type=openapi.TYPE_INTEGER)
-                }
-            )
-        ),
-        403: openapi.Response(description="Sin permisos de administrador"),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_admin()
-)
+        cache_manager.set(
+            f"{cache_key}:gz",
+            compress_categories_payload(formatted_response),
+            timeout=CacheTimeouts.STATIC_DATA
+        )
+        logger.debug("Categorías públicas guardadas en cache")
+    except Exception:
+        # Cache failures should not break the response
+        logger.debug("No se pudo guardar cache de categorías públicas")
+    return formatted_response
+
+
 @extend_schema(
     summary="Listar categorías (Admin)",
     description="Obtiene todas las categorías del sistema con información completa. Solo disponible para administradores.",
@@ -112,94 +312,26 @@ def list_categories_admin(request):
         # Generar clave de cache
         search = request.GET.get('search', '')
         ordering = request.GET.get('ordering', '')
-        cache_key_params = {
-            'admin': True,
-            'search': search,
-            'ordering': ordering
-        }
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_CATEGORY
+        cache_key = categories_list_cache_key(
+            'admin', request.GET.get('page', 1), search=search, ordering=ordering)
 
         # Intentar obtener del cache
-        cached_response = cache_manager.get(
-            CacheKeys.CATEGORIES_LIST, **cache_key_params)
+        cached_response = cache_manager.get(cache_key)
         if cached_response is not None:
             logger.debug("Categorías admin obtenidas del cache")
             return Response(cached_response, status=status.HTTP_200_OK)
 
         # Si no está en cache, obtener de la base de datos
-        categories = selectors.list_categories_admin()
-
-        # Aplicar paginación con manejo de errores para tests
-        try:
-            page_data = paginator.paginate_queryset(categories, request)
-        except (TypeError, AttributeError):
-            # Si falla con objetos mock/fake, convertir a lista
-            categories = list(categories)
-            page_data = paginator.paginate_queryset(categories, request)
-
-        serializer = CategoryPrivateSerializer(page_data, many=True)
-        response_data = paginator.get_paginated_response(serializer.data)
+        formatted_response = build_categories_admin_response(
+            request, cache_key)
 
-        # Formatear respuesta según estándar
-        formatted_response = {
-            "success": True,
-            "message": "Categorías obtenidas exitosamente",
-            "data": response_data.data
-        }
+        logger.info("Admin %s accessed categories list", request.user.id)
+        return Response(formatted_response, status=status.HTTP_200_OK)
+    except DatabaseError:
+        logger.exception("Error listing admin categories")
+        return _database_error_response("Error al obtener categorías")
 
-        # Guardar en cache
-        cache_manager.set(
-            CacheKeys.CATEGORIES_LIST,
-            formatted_response,
-            timeout=CacheTimeouts.MASTER_DATA,
-            **cache_key_params
-        )
 
-        logger.info(f"Admin {request.user.id} accessed categories list")
-        return Response(formatted_response, status=status.HTTP_200_OK)
-    except Exception as e:
-        logger.error(f"Error listing admin categories: {str(e)}")
-        return Response({
-            "success": False,
-            "message": "Error al obtener categorías",
-            "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-@swagger_auto_schema(
-    method='post',
-    operation_summary="Crear categoría",
-    operation_description="Crea una nueva categoría en el sistema. Solo disponible para administradores.",
-    request_body=CategoryPrivateSerializer,
-    responses={
-        201: openapi.Response(
-            description="Categoría creada exitosamente",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': CategoryPrivateSerializer
-                }
-            )
-        ),
-        400: openapi.Response(
-            description="Datos inválidos",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=False),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'errors': openapi.Schema(type=openapi.TYPE_OBJECT)
-                }
-            )
-        ),
-        403: openapi.Response(description="Sin permisos de administrador"),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_admin()
-)
 @extend_schema(
     summary="Crear categoría",
     description="Crea una nueva categoría en el sistema. Solo disponible para administradores.",
@@ -238,14 +370,14 @@ def create_category(request):
         )
 
         # Invalidar cache de categorías después de crear
-        _invalidate_categories_cache()
+        _invalidate_categories_cache(request)
 
         logger.info(
-            f"Category created successfully by admin {request.user.id}: {result['message']}")
+            "Category created successfully by admin %s: %s", request.user.id, result['message'])
 
-        # Serializar la categoría creada para la respuesta
-        category_data = CategoryPrivateSerializer(
-            result["data"]).data
+        # Reutilizar el serializer ya validado para la respuesta
+        serializer.instance = result["data"]
+        category_data = serializer.data
 
         return Response({
             "success": True,
@@ -253,47 +385,16 @@ def create_category(request):
             "data":  category_data
         }, status=status.HTTP_201_CREATED)
 
-    except Exception as e:
-        logger.error(
-            f"Error creating category by admin {request.user.id}: {str(e)}")
-        return Response({
-            "success": False,
-            "message": "Error al crear categoría",
-            "error": str(e)
-        }, status=status.HTTP_400_BAD_REQUEST)
-
-
-@swagger_auto_schema(
-    method='get',
-    operation_summary="Obtener categoría específica (Admin)",
-    operation_description="Obtiene los detalles completos de una categoría específica. Solo disponible para administradores.",
-    manual_parameters=[
-        openapi.Parameter(
-            'id',
-            openapi.IN_PATH,
-            description="ID único de la categoría",
-            type=openapi.TYPE_INTEGER,
-            required=True
-        )
-    ],
-    responses={
-        200: openapi.Response(
-            description="Detalles de la categoría",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': CategoryPrivateSerializer
-                }
-            )
-        ),
-        403: openapi.Response(description="Sin permisos de administrador"),
-        404: openapi.Response(description="Categoría no encontrada"),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_admin()
-)
+    except VALIDATION_ERRORS as e:
+        logger.warning(
+            "Invalid category data from admin %s: %s", request.user.id, e)
+        return _validation_error_response("Error al crear categoría", e)
+    except DatabaseError:
+        logger.exception(
+            "Error creating category by admin %s", request.user.id)
+        return _database_error_response("Error al crear categoría")
+
+
 @extend_schema(
     summary="Obtener categoría específica (Admin)",
     description="Obtiene los detalles completos de una categoría específica. Solo disponible para administradores.",
@@ -323,54 +424,27 @@ def get_category_admin(request, pk):
         500: Error interno del servidor
     """
     try:
-        category = get_object_or_404(Category, pk=pk)
-        serializer = CategoryPrivateSerializer(category)
-        logger.info(f"Admin {request.user.id} accessed category {pk}")
+        cache_key = category_detail_cache_key(pk, 'admin')
+        data = cache_manager.get(cache_key)
+        if data is None:
+            category = selectors.get_category_admin(pk)
+            if category is None:
+                return Response({
+                    "success": False,
+                    "message": "Categoría no encontrada"
+                }, status=status.HTTP_404_NOT_FOUND)
+            data = CategoryPrivateSerializer(category).data
+            cache_manager.set(cache_key, data,
+                              timeout=CacheTimeouts.MASTER_DATA)
+        logger.info("Admin %s accessed category %s", request.user.id, pk)
         return Response({"success": True,
                          "message": "Category retrieved successfully.",
-                         "data": serializer.data}, status=status.HTTP_200_OK)
-    except Exception as e:
-        logger.error(f"Error getting category {id}: {str(e)}")
-        return Response({
-            "success": False,
-            "message": "Error al obtener categoría",
-            "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-@swagger_auto_schema(
-    methods=['put', 'patch'],
-    operation_summary="Actualizar categoría",
-    operation_description="Actualiza una categoría existente. PUT para actualización completa, PATCH para parcial. Solo disponible para administradores.",
-    manual_parameters=[
-        openapi.Parameter(
-            'id',
-            openapi.IN_PATH,
-            description="ID único de la categoría a actualizar",
-            type=openapi.TYPE_INTEGER,
-            required=True
-        )
-    ],
-    request_body=CategoryPrivateSerializer,
-    responses={
-        200: openapi.Response(
-            description="Categoría actualizada exitosamente",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': CategoryPrivateSerializer
-                }
-            )
-        ),
-        400: openapi.Response(description="Datos inválidos"),
-        403: openapi.Response(description="Sin permisos de administrador"),
-        404: openapi.Response(description="Categoría no encontrada"),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_admin()
-)
+                         "data": data}, status=status.HTTP_200_OK)
+    except DatabaseError:
+        logger.exception("Error getting category %s", pk)
+        return _database_error_response("Error al obtener categoría")
+
+
 @extend_schema(
     summary="Actualizar categoría",
     description="Actualiza una categoría existente. PUT para actualización completa, PATCH para parcial. Solo disponible para administradores.",
@@ -406,102 +480,72 @@ def update_category(request, pk):
         500: Error interno del servidor o fallo en la actualización
     """
     try:
-        category = Category.objects.select_for_update().filter(id=pk).first()
-        partial = request.method == 'PATCH'
-
-        serializer = CategoryPrivateSerializer(
-            category, data=request.data, partial=partial
-        )
-        serializer.is_valid(raise_exception=True)
-
-        # Solo se aplica servicio especial si se cambia el nombre
-        if "name" in serializer.validated_data:
-            result = services.rename_category(
-                user=request.user,
-                category=category,
-                new_name=serializer.validated_data["name"]
+        # El bloqueo de select_for_update() solo tiene efecto dentro de una
+        # transacción: la lectura y el renombrado se ejecutan en el mismo bloque
+        with transaction.atomic():
+            category = Category.objects.select_for_update().filter(id=pk).first()
+            if category is None:
+                return Response({
+                    "success": False,
+                    "message": "Categoría no encontrada"
+                }, status=status.HTTP_404_NOT_FOUND)
+            partial = request.method == 'PATCH'
+
+            serializer = CategoryPrivateSerializer(
+                category, data=request.data, partial=partial
             )
+            serializer.is_valid(raise_exception=True)
+
+            # Solo se aplica servicio especial si se cambia el nombre
+            if "name" in serializer.validated_data:
+                result = services.rename_category(
+                    user=request.user,
+                    category=category,
+                    new_name=serializer.validated_data["name"]
+                )
+
+                _invalidate_categories_cache(request)
+                logger.info(
+                    "Category updated successfully by admin %s: %s", request.user.id, result['message'])
+
+                # El servicio modifica la misma instancia ligada al serializer,
+                # por lo que se reutiliza para la respuesta
+                serializer.instance = result["data"]["category"]
+                category_data = serializer.data
+
+                return Response({
+                    "success": True,
+                    "message": result["message"],
+                    "data": {
+                        "category": category_data,
+                        "old_name": result["data"]["old_name"],
+                        "new_name": result["data"]["new_name"]
+                    }
+                }, status=status.HTTP_200_OK)
+            else:
+                # Si no hay cambio de nombre, usar actualización estándar
+                serializer.save()
+                _invalidate_categories_cache(request)
+                logger.info("Category %s updated by admin %s", pk, request.user.id)
+
+                return Response({
+                    "success": True,
+                    "message": "Categoría actualizada exitosamente",
+                    "data": {
+                        "category": serializer.data
+                    }
+                }, status=status.HTTP_200_OK)
+
+    except VALIDATION_ERRORS as e:
+        logger.warning(
+            "Invalid update for category %s by admin %s: %s", pk, request.user.id, e)
+        return _validation_error_response("Error al actualizar categoría", e)
+    except DatabaseError:
+        logger.exception(
+            "Error updating category %s by admin %s", pk, request.user.id)
+        return _database_error_response("Error al actualizar categoría")
 
-            logger.info(
-                f"Category updated successfully by admin {request.user.id}: {result['message']}")
-
-            # Serializar la categoría actualizada para la respuesta
-            category_data = CategoryPrivateSerializer(
-                result["data"]["category"]).data
-
-            return Response({
-                "success": True,
-                "message": result["message"],
-                "data": {
-                    "category": category_data,
-                    "old_name": result["data"]["old_name"],
-                    "new_name": result["data"]["new_name"]
-                }
-            }, status=status.HTTP_200_OK)
-        else:
-            # Si no hay cambio de nombre, usar actualización estándar
-            serializer.save()
-            logger.info(f"Category {id} updated by admin {request.user.id}")
 
-            return Response({
-                "success": True,
-                "message": "Categoría actualizada exitosamente",
-                "data": {
-                    "category": serializer.data
-                }
-            }, status=status.HTTP_200_OK)
-
-    except Exception as e:
-        logger.error(
-            f"Error updating category {id} by admin {request.user.id}: {str(e)}")
-        return Response({
-            "success": False,
-            "message": "Error al actualizar categoría",
-            "error": str(e)
-        }, status=status.HTTP_400_BAD_REQUEST)
-
-
-@swagger_auto_schema(
-    method='delete',
-    operation_summary="Eliminar categoría",
-    operation_description="Elimina una categoría del sistema. Solo disponible para administradores.",
-    manual_parameters=[
-        openapi.Parameter(
-            'id',
-            openapi.IN_PATH,
-            description="ID único de la categoría a eliminar",
-            type=openapi.TYPE_INTEGER,
-            required=True
-        )
-    ],
-    responses={
-        204: openapi.Response(
-            description="Categoría eliminada exitosamente",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        ),
-        400: openapi.Response(
-            description="No se puede eliminar categoría con productos asociados",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=False),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'error': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        ),
-        403: openapi.Response(description="Sin permisos de administrador"),
-        404: openapi.Response(description="Categoría no encontrada"),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_admin()
-)
 @extend_schema(
     summary="Eliminar categoría",
     description="Elimina una categoría del sistema. Solo disponible para administradores.",
@@ -536,67 +580,197 @@ def delete_category(request, pk):
         no tenga productos asociados antes de eliminar.
     """
     try:
-        category = get_object_or_404(Category, pk=pk)
+        # Una sola consulta: nombre de la categoría + EXISTS de productos asociados
+        category = selectors.get_category_for_delete(pk)
+        if category is None:
+            return Response({
+                "success": False,
+                "message": "Categoría no encontrada"
+            }, status=status.HTTP_404_NOT_FOUND)
         category_name = category.name
 
-        # Verificar si tiene productos asociados (ejemplo de validación)
-        if hasattr(category, 'product_set') and category.product_set.exists():
+        # Verificar si tiene productos asociados
+        if category.has_products:
             logger.warning(
-                f"Admin {request.user.id} tried to delete category {pk} with associated products")
+                "Admin %s tried to delete category %s with associated products", request.user.id, pk)
             return Response({
                 "success": False,
                 "message": f"No se puede eliminar la categoría '{category_name}' porque tiene productos asociados"
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        category.delete()
+        # Borrado a nivel de queryset: evita el SELECT previo de instance.delete()
+        Category.objects.filter(pk=pk).delete()
+        _invalidate_categories_cache(request)
         logger.info(
-            f"Category '{category_name}' deleted successfully by admin {request.user.id}")
+            "Category '%s' deleted successfully by admin %s", category_name, request.user.id)
 
         return Response({
             "success": True,
             "message": f"Categoría '{category_name}' eliminada exitosamente"
         }, status=status.HTTP_204_NO_CONTENT)
 
-    except Exception as e:
-        logger.error(
-            f"Error deleting category {id} by admin {request.user.id}: {str(e)}")
+    except IntegrityError as e:
+        logger.warning(
+            "Category %s could not be deleted by admin %s: %s", pk, request.user.id, e)
+        return _validation_error_response("Error al eliminar categoría", e)
+    except DatabaseError:
+        logger.exception(
+            "Error deleting category %s by admin %s", pk, request.user.id)
+        return _database_error_response("Error al eliminar categoría")
+
+
+@extend_schema(
+    summary="Crear categorías en lote",
+    description="Crea múltiples categorías en una sola operación. Solo disponible para administradores.",
+    parameters=[
+        OpenApiParameter(name='skip_existing', required=False, location=OpenApiParameter.QUERY, type=OpenApiTypes.BOOL,
+                         description="Si es true, omite nombres repetidos o ya existentes en lugar de rechazar el lote"),
+    ],
+    request=CategoryPrivateSerializer(many=True),
+    responses={201: CategoryPrivateSerializer(many=True)},
+    tags=categories_admin(),
+)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_create_categories(request):
+    """
+    Crea múltiples categorías en una sola operación.
+
+    Valida todo el lote con un único serializer (many=True), crea las
+    categorías con bulk_create en una sola transacción e invalida el cache
+    una única vez.
+
+    Request Body:
+        list: Lista de objetos CategoryPrivateSerializer (ej: [{"name": "hogar"}])
+
+    Query Parameters:
+        skip_existing (bool, optional): Si es true, omite nombres repetidos o
+            existentes (importaciones masivas)
+
+    Returns:
+        Response: Categorías creadas siguiendo el estándar de respuestas
+
+    Raises:
+        400: Lista vacía, datos inválidos o nombres duplicados (sin skip_existing)
+        403: Usuario sin permisos de administrador
+    """
+    try:
+        if not isinstance(request.data, list) or len(request.data) == 0:
+            return Response({
+                "success": False,
+                "message": "Lista de categorías inválida",
+                "error": "Request body must be a non-empty list"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = CategoryPrivateSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        skip_existing = request.GET.get(
+            'skip_existing', 'false').lower() == 'true'
+
+        result = services.create_categories(
+            user=request.user,
+            names=[item["name"] for item in serializer.validated_data],
+            skip_existing=skip_existing
+        )
+
+        # Invalidar cache de categorías una sola vez para todo el lote
+        _invalidate_categories_cache(request)
+
+        logger.info(
+            "Bulk created categories by admin %s: %s", request.user.id, result['message'])
+
+        # Reutilizar el serializer ya validado para la respuesta
+        serializer.instance = result["data"]
         return Response({
-            "success": False,
-            "message": "Error al eliminar categoría",
-            "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-@swagger_auto_schema(
-    method='get',
-    operation_summary="Listar categorías públicas",
-    operation_description="Obtiene todas las categorías activas disponibles para usuarios públicos.",
-    responses={
-        200: openapi.Response(
-            description="Lista de categorías públicas",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': openapi.Schema(
-                        type=openapi.TYPE_ARRAY,
-                        items=CategoryPublicSerializer
-                    ),
-                    'count': openapi.Schema(type=openapi.TYPE_INTEGER)
-                }
-            )
-        ),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_public()
+            "success": True,
+            "message": result["message"],
+            "data": serializer.data
+        }, status=status.HTTP_201_CREATED)
+
+    except VALIDATION_ERRORS as e:
+        logger.warning(
+            "Invalid bulk category data from admin %s: %s", request.user.id, e)
+        return _validation_error_response("Error al crear categorías", e)
+    except DatabaseError:
+        logger.exception(
+            "Error bulk creating categories by admin %s", request.user.id)
+        return _database_error_response("Error al crear categorías")
+
+
+@extend_schema(
+    summary="Renombrar categorías en lote",
+    description="Renombra múltiples categorías en una sola operación. Solo disponible para administradores.",
+    request=CategoryBulkRenameSerializer(many=True),
+    responses={200: CategoryPrivateSerializer(many=True)},
+    tags=categories_admin(),
 )
+@api_view(['PATCH'])
+@permission_classes([IsAdminUser])
+def bulk_update_categories(request):
+    """
+    Renombra múltiples categorías en una sola operación.
+
+    Valida todo el lote, aplica los cambios con bulk_update en una sola
+    transacción e invalida el cache una única vez.
+
+    Request Body:
+        list: Lista de objetos {"id": int, "name": str}
+
+    Returns:
+        Response: Categorías actualizadas siguiendo el estándar de respuestas
+
+    Raises:
+        400: Lista vacía, datos inválidos, categorías inexistentes o nombres duplicados
+        403: Usuario sin permisos de administrador
+    """
+    try:
+        if not isinstance(request.data, list) or len(request.data) == 0:
+            return Response({
+                "success": False,
+                "message": "Lista de categorías inválida",
+                "error": "Request body must be a non-empty list"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = CategoryBulkRenameSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        result = services.rename_categories(
+            user=request.user,
+            renames=serializer.validated_data
+        )
+
+        # Invalidar cache de categorías una sola vez para todo el lote
+        _invalidate_categories_cache(request)
+
+        logger.info(
+            "Bulk renamed categories by admin %s: %s", request.user.id, result['message'])
+
+        return Response({
+            "success": True,
+            "message": result["message"],
+            "data": CategoryPrivateSerializer(result["data"], many=True).data
+        }, status=status.HTTP_200_OK)
+
+    except VALIDATION_ERRORS as e:
+        logger.warning(
+            "Invalid bulk category update from admin %s: %s", request.user.id, e)
+        return _validation_error_response("Error al actualizar categorías", e)
+    except DatabaseError:
+        logger.exception(
+            "Error bulk updating categories by admin %s", request.user.id)
+        return _database_error_response("Error al actualizar categorías")
+
+
 @extend_schema(
     summary="Listar categorías públicas",
     description="Obtiene todas las categorías activas disponibles para usuarios públicos.",
     responses={200: CategoryPublicSerializer(many=True)},
     tags=categories_public(),
 )
+@cache_control(public=True, max_age=PUBLIC_CATEGORIES_MAX_AGE)
+@vary_on_headers('Accept')
+@condition(etag_func=categories_etag, last_modified_func=categories_last_modified)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_categories_public(request):
@@ -611,100 +785,46 @@ def list_categories_public(request):
 
     Raises:
         500: Error interno del servidor o fallo en la consulta
+
+    Note:
+        Soporta GET condicional (ETag/Last-Modified): si el cliente envía la
+        versión vigente responde 304 sin ejecutar la vista. La respuesta es
+        cacheable por clientes/proxies durante PUBLIC_CATEGORIES_MAX_AGE
+        segundos. Si el cliente acepta gzip se sirve el JSON precomprimido
+        al escribir el cache.
     """
     try:
         page_number = request.query_params.get('page', 1)
-        cache_key_params = {'public': True, 'page': page_number}
+        cache_key = categories_list_cache_key(
+            'public', page_number, version=get_categories_cache_version())
+
+        use_gzip = accepts_gzip(request)
+
+        # Servir los bytes precomprimidos si el cliente acepta gzip
+        if use_gzip:
+            cached_body = _get_public_cached(f"{cache_key}:gz")
+            if cached_body is not None:
+                logger.debug("Categorías públicas (gzip) obtenidas del cache")
+                return _gzip_json_response(cached_body)
+
         # Intentar obtener del cache
-        cached_response = cache_manager.get(
-            CacheKeys.CATEGORIES_LIST, **cache_key_params)
-        if cached_response is not None:
+        cached_response = _get_public_cached(cache_key)
+        if cached_response is None:
+            # Si no está en cache, obtener de la base de datos
+            cached_response = build_categories_public_response(
+                request, cache_key)
+            local_categories_cache.set(cache_key, cached_response)
+        else:
             logger.debug("Categorías públicas obtenidas del cache")
-            return Response(cached_response, status=status.HTTP_200_OK)
 
-        # Si no está en cache, obtener de la base de datos
-        categories = selectors.list_categories_public()
-
-        # Algunos selectores pueden devolver iterables que no implementan
-        # __len__ o count (p.ej. objetos falsos en tests). Para asegurar
-        # compatibilidad, convertir a lista si es necesario
-        try:
-            # Intentar usar directamente con el paginador
-            paginator = PageNumberPagination()
-            paginator.page_size = PAGINATION_PAGE_SIZE_CATEGORY
-            page_data = paginator.paginate_queryset(categories, request)
-        except (TypeError, AttributeError):
-            # Si falla, convertir a lista y reintentar
-            categories = list(categories)
-            paginator = PageNumberPagination()
-            paginator.page_size = PAGINATION_PAGE_SIZE_CATEGORY
-            page_data = paginator.paginate_queryset(categories, request)
-
-        serialized_data = CategoryPublicSerializer(page_data, many=True).data
-
-        # Devolver response ya paginada con formato estándar
-        response = paginator.get_paginated_response(serialized_data)
-
-        # Formatear según estándar de respuesta
-        formatted_response = {
-            "success": True,
-            "message": "Categorías públicas obtenidas exitosamente",
-            "data": response.data
-        }
+        response = Response(cached_response, status=status.HTTP_200_OK)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+    except DatabaseError:
+        logger.exception("Error listing public categories")
+        return _database_error_response("Error al obtener categorías públicas")
 
-        # Cache the formatted response data
-        try:
-            cache_manager.set(
-                CacheKeys.CATEGORIES_LIST,
-                formatted_response,
-                timeout=CacheTimeouts.STATIC_DATA,
-                **cache_key_params
-            )
-            logger.debug("Categorías públicas guardadas en cache")
-        except Exception:
-            # Cache failures should not break the response
-            logger.debug("No se pudo guardar cache de categorías públicas")
 
-        return Response(formatted_response, status=status.HTTP_200_OK)
-    except Exception as e:
-        logger.error(f"Error listing public categories: {str(e)}")
-        return Response({
-            "success": False,
-            "message": "Error al obtener categorías públicas",
-            "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-@swagger_auto_schema(
-    method='get',
-    operation_summary="Obtener categoría específica (Público)",
-    operation_description="Obtiene los detalles públicos de una categoría específica.",
-    manual_parameters=[
-        openapi.Parameter(
-            'id',
-            openapi.IN_PATH,
-            description="ID único de la categoría a consultar",
-            type=openapi.TYPE_INTEGER,
-            required=True
-        )
-    ],
-    responses={
-        200: openapi.Response(
-            description="Detalles públicos de la categoría",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': CategoryPublicSerializer
-                }
-            )
-        ),
-        404: openapi.Response(description="Categoría no encontrada o inactiva"),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_public()
-)
 @extend_schema(
     summary="Obtener categoría específica (Público)",
     description="Obtiene los detalles públicos de una categoría específica.",
@@ -715,6 +835,9 @@ def list_categories_public(request):
     responses={200: CategoryPublicSerializer},
     tags=categories_public(),
 )
+@cache_control(public=True, max_age=PUBLIC_CATEGORIES_MAX_AGE)
+@vary_on_headers('Accept')
+@condition(etag_func=categories_etag, last_modified_func=categories_last_modified)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_category_public(request, id):
@@ -733,60 +856,39 @@ def get_category_public(request, id):
     Raises:
         404: Categoría no encontrada o inactiva
         500: Error interno del servidor
+
+    Note:
+        Soporta GET condicional (ETag/Last-Modified): si el cliente envía la
+        versión vigente responde 304 sin ejecutar la vista.
     """
     try:
-        category = get_object_or_404(Category, pk=id)
-        serializer = CategoryPublicSerializer(category)
-        return success_response("Category retrieved successfully.", serializer.data)
-    except Exception as e:
-        logger.error(f"Error getting public category {id}: {str(e)}")
+        cache_key = category_detail_cache_key(id, 'public')
+        data = _get_public_cached(cache_key)
+        if data is None:
+            category = selectors.get_category_public(id)
+            if category is None:
+                return not_found_error_response("Categoría no encontrada")
+            data = CategoryPublicSerializer(category).data
+            cache_manager.set(cache_key, data,
+                              timeout=CacheTimeouts.STATIC_DATA)
+            local_categories_cache.set(cache_key, data)
+        return success_response("Category retrieved successfully.", data)
+    except DatabaseError:
+        logger.exception("Error getting public category %s", id)
         return server_error_response("Error al obtener categoría pública")
 
 
-@swagger_auto_schema(
-    method='get',
-    operation_summary="Categorías con promociones activas",
-    operation_description="Obtiene las categorías que tienen promociones activas aplicadas.",
-    responses={
-        200: openapi.Response(
-            description="Lista de categorías con promociones activas",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'success': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
-                    'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    'data': openapi.Schema(
-                        type=openapi.TYPE_ARRAY,
-                        items=openapi.Schema(
-                            type=openapi.TYPE_OBJECT,
-                            properties={
-                                'category': CategoryPublicSerializer,
-                                'active_promotions': openapi.Schema(
-                                    type=openapi.TYPE_ARRAY,
-                                    items=openapi.Schema(
-                                        type=openapi.TYPE_OBJECT)
-                                ),
-                                'promotion_count': openapi.Schema(type=openapi.TYPE_INTEGER)
-                            }
-                        )
-                    ),
-                    'count': openapi.Schema(type=openapi.TYPE_INTEGER)
-                }
-            )
-        ),
-        500: openapi.Response(description="Error interno del servidor")
-    },
-    tags=categories_public()
-)
 @extend_schema(
     summary="Categorías con promociones activas",
     description="Obtiene las categorías que tienen promociones activas aplicadas.",
+    parameters=[
+        OpenApiParameter(name='cursor', required=False, location=OpenApiParameter.QUERY, type=OpenApiTypes.STR,
+                         description="Cursor de paginación devuelto en los enlaces next/previous"),
+    ],
     responses={200: OpenApiTypes.OBJECT},
     tags=categories_public(),
 )
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def get_categories_with_promotions(request):
+class CategoriesWithPromotionsView(ListAPIView):
     """
     Obtiene las categorías que tienen promociones activas.
 
@@ -794,38 +896,34 @@ def get_categories_with_promotions(request):
     que actualmente tienen promociones activas aplicadas, junto con
     información básica de las promociones.
 
+    Usa el flujo estándar de ListAPIView: QuerySet perezoso, paginación por
+    cursor en SQL y prefetch de promociones/reglas solo para la página.
+
     Returns:
         Response: Lista de categorías con promociones activas siguiendo
                  el estándar de respuestas
 
     Raises:
-        500: Error interno del servidor o fallo en la consulta
+        404: Cursor de paginación inválido
 
     Note:
         Solo se muestran categorías activas con al menos una promoción
-        vigente en el momento de la consulta.
+        vigente en el momento de la consulta. Los errores inesperados los
+        manejan DRF y SecureErrorMiddleware.
     """
-    try:
-        result = services.get_all_categories_with_promotions()
-        categories = result["data"]
-
-        # Instancia de paginador
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_CATEGORY
+    permission_classes = [AllowAny]
+    serializer_class = CategoryWithPromotionsSerializer
+    pagination_class = CategoryCursorPagination
 
-        # Paginar la lista en memoria
-        page = paginator.paginate_queryset(categories, request)
+    def get_queryset(self):
+        return services.get_categories_with_promotions_queryset(
+            only_with_promotions=True)
 
-        return paginator.get_paginated_response({
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data = {
             "success": True,
-            "message": result["message"],
-            "data": page
-        })
-
-    except Exception as e:
-        logger.error(f"Error obteniendo categorías con promociones: {str(e)}")
-        return Response({
-            "success": False,
-            "message": "Error al obtener categorías con promociones",
-            "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            "message": "Categories retrieved successfully.",
+            "data": response.data
+        }
+        return response
@@ -47,6 +47,7 @@ class InventoryRecord(models.Model):
         verbose_name_plural = "Inventarios"
         ordering = ['product', '-quantity']
         constraints = [
+            # También es el índice de las búsquedas y upserts por clave completa
             models.UniqueConstraint(
                 fields=['product', 'location', 'batch_code', 'expiry_date'],
                 name='uq_invrec'
@@ -55,8 +56,10 @@ class InventoryRecord(models.Model):
         indexes = [
             models.Index(fields=['product'], name='idx_invrc_product'),
             models.Index(fields=['location'], name='idx_invrec_location'),
+            # Alineado con el SELECT FOR UPDATE del consumo FEFO (producto,
+            # depósito, vencimiento, id): rango por índice, sin filesort
             models.Index(fields=["product", "location",
-                         "batch_code", "expiry_date"], name="idx_invrec_prod_loc_bat_exp"),
+                         "expiry_date", "id"], name="idx_invrec_fefo"),
         ]
 
 
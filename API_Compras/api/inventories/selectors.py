@@ -1,4 +1,13 @@
+from django.core import exceptions
+from api.products.models import Product
+from api.storage_location.models import StorageLocation
 from .models import InventoryMovement, InventoryRecord
+from .utils import movement_targets_cache
+
+# Columnas que lee InventoryRecordOutSerializer: cargar solo estas es seguro
+# porque el serializer usa product_id/location_id y no desreferencia las FK.
+OUT_FIELDS = ("id", "product_id", "location_id", "quantity",
+              "batch_code", "expiry_date", "updated_at")
 
 
 def list_inventory_records():
@@ -27,3 +36,56 @@ def select_inventory_record_by_record(record_id: int):
     return InventoryRecord.objects.select_related(
         "product", "location", "updated_by"
     ).get(id=record_id)
+
+
+def list_inventory_records_out():
+    return InventoryRecord.objects.only(*OUT_FIELDS)
+
+
+def select_movement_targets(product_id, location_ids):
+    """
+    Resuelve el producto y las ubicaciones de un movimiento de inventario.
+
+    Trae solo las columnas que usan los servicios (id y name) y resuelve
+    todas las ubicaciones con un único `in_bulk`, en lugar de un SELECT
+    completo por cada FK. Las instancias se guardan en el cache local del
+    proceso, así que con el cache caliente no se consulta la base.
+
+    Args:
+        product_id (int): ID del producto.
+        location_ids (Iterable[int]): IDs de las ubicaciones involucradas.
+
+    Returns:
+        tuple[Product, dict[int, StorageLocation]]: Producto y ubicaciones por ID.
+
+    Raises:
+        ValidationError: Si el producto o alguna ubicación no existe.
+    """
+    product = movement_targets_cache.get(("product", product_id))
+    if product is None:
+        product = Product.objects.only(
+            "id", "name").filter(pk=product_id).first()
+        if product is None:
+            raise exceptions.ValidationError(
+                f"El producto {product_id} no existe.")
+        movement_targets_cache.set(("product", product_id), product)
+
+    locations = {}
+    missing = set()
+    for pk in set(location_ids):
+        location = movement_targets_cache.get(("location", pk))
+        if location is None:
+            missing.add(pk)
+        else:
+            locations[pk] = location
+
+    if missing:
+        fetched = StorageLocation.objects.only("id", "name").in_bulk(missing)
+        for pk, location in fetched.items():
+            movement_targets_cache.set(("location", pk), location)
+        locations.update(fetched)
+        missing -= fetched.keys()
+        if missing:
+            raise exceptions.ValidationError(
+                f"Ubicaciones inexistentes: {sorted(missing)}.")
+    return product, locations
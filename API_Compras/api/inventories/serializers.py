@@ -1,21 +1,76 @@
 from rest_framework import serializers
-from .models import InventoryRecord
+from rest_framework.fields import get_attribute
+
+# Campos sin enlazar reutilizados para formatear fechas igual que DRF
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
 
 # Para responder con IR (opcional)
 
 
-class InventoryRecordOutSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = InventoryRecord
-        fields = ["id", "product", "location", "quantity",
-                  "batch_code", "expiry_date", "updated_at"]
+class InventoryRecordOutSerializer(serializers.Serializer):
+    """
+    Serializer de salida de un registro de inventario.
+
+    Declara los campos explícitamente (sin la introspección de
+    ModelSerializer) y lee `product_id`/`location_id` de la propia fila,
+    por lo que nunca desreferencia las FK. La salida se arma como un dict
+    literal; los campos declarados documentan el esquema.
+    """
+    id = serializers.IntegerField(read_only=True)
+    product = serializers.IntegerField(source="product_id", read_only=True)
+    location = serializers.IntegerField(source="location_id", read_only=True)
+    quantity = serializers.IntegerField(read_only=True)
+    batch_code = serializers.CharField(allow_null=True, read_only=True)
+    expiry_date = serializers.DateField(allow_null=True, read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
+
+    def to_representation(self, instance):
+        # dict literal: sin recorrer _readable_fields ni get_attribute por campo
+        return {
+            "id": instance.id,
+            "product": instance.product_id,
+            "location": instance.location_id,
+            "quantity": instance.quantity,
+            "batch_code": instance.batch_code,
+            "expiry_date": _date_field.to_representation(instance.expiry_date) if instance.expiry_date else None,
+            "updated_at": _datetime_field.to_representation(instance.updated_at) if instance.updated_at else None,
+        }
+
+
+def _represent_row(item, pipeline) -> dict:
+    """Serializa un elemento aplicando un pipeline (nombre, atributos, to_representation)."""
+    row = {}
+    for name, attrs, to_representation in pipeline:
+        value = get_attribute(item, attrs)
+        row[name] = None if value is None else to_representation(value)
+    return row
+
+
+class InventoryRecordDetailsListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer para el listado de registros con detalles.
+
+    Recorre las filas en un bucle simple con el pipeline de campos del
+    serializer hijo, en lugar de iterar `_readable_fields` por cada elemento.
+    """
+
+    def to_representation(self, data):
+        pipeline = self.child.get_field_pipeline()
+        return [_represent_row(item, pipeline) for item in data]
 
 
 class InventoryRecordWithDetailsSerializer(serializers.Serializer):
     """
     Serializer para registros de inventario con información adicional.
     Maneja el formato de datos devuelto por get_inventory_record().
+
+    El nombre, la ruta de atributos y el `to_representation` de cada campo
+    se resuelven una sola vez por clase (`get_field_pipeline`); son campos
+    de solo lectura cuya salida no depende del serializer que los enlaza.
     """
+    _field_pipeline = None
+
     # Información básica del registro
     record_id = serializers.IntegerField(source='record.id', read_only=True)
     quantity = serializers.IntegerField(read_only=True)
@@ -38,3 +93,16 @@ class InventoryRecordWithDetailsSerializer(serializers.Serializer):
             'created_at', 'updated_at', 'product_id', 'product_name',
             'location_id', 'location_name'
         ]
+        list_serializer_class = InventoryRecordDetailsListSerializer
+
+    @classmethod
+    def get_field_pipeline(cls):
+        if cls.__dict__.get("_field_pipeline") is None:
+            cls._field_pipeline = tuple(
+                (field.field_name, field.source_attrs, field.to_representation)
+                for field in cls()._readable_fields
+            )
+        return cls._field_pipeline
+
+    def to_representation(self, instance):
+        return _represent_row(instance, self.get_field_pipeline())
@@ -1,13 +1,272 @@
-from django.db import transaction, models
+from django.db import connection, transaction, models
 from django.core import exceptions
+from django.utils import timezone
 from .models import InventoryMovement, InventoryRecord
 from api.storage_location.models import StorageLocation
 from api.products.models import Product
 from api.users.models import CustomUser
-from .utils import get_total_stock
 from datetime import date
 from api.utils import validate_id
 
+# Tamaño de lote de las escrituras masivas (acota el tamaño de cada INSERT/UPDATE)
+INVENTORY_BULK_BATCH = 1000
+
+# Columnas de los registros origen que necesita el consumo FEFO
+FEFO_FIELDS = ("pk", "quantity", "batch_code", "expiry_date")
+
+
+class StockContentionError(Exception):
+    """
+    El stock existe pero parte está bloqueada por otra transacción concurrente.
+
+    Es reintentable: los registros omitidos por `skip_locked` se liberan al
+    confirmarse la otra operación. No hereda de `ValidationError` para que
+    los llamadores no lo traten como un error de datos del cliente.
+    """
+
+
+# Opciones de adjustment_inventory como bits de una máscara
+_ADJUST_AGGREGATE = 0b001
+_ADJUST_REMOVE = 0b010
+_ADJUST_OTHER = 0b100
+
+
+def _stock_shortage_error(from_location, available):
+    """
+    Construye el error de stock faltante en origen.
+
+    Args:
+        from_location (StorageLocation): Ubicación origen.
+        available (int): Stock total disponible en origen.
+
+    Returns:
+        ValidationError: "No hay stock" o "Stock insuficiente".
+    """
+    if available == 0:
+        return exceptions.ValidationError(
+            f"No hay stock en {from_location.name}.")
+    return exceptions.ValidationError(
+        f"Stock insuficiente en {from_location.name}.")
+
+
+def _lock_fefo_rows(product, from_location, quantity):
+    """
+    Bloquea y devuelve los registros origen consumibles en orden FEFO.
+
+    Primero valida el stock con una suma sin lock: los pedidos que no se
+    pueden cubrir fallan sin bloquear filas. Luego usa
+    `SELECT FOR UPDATE SKIP LOCKED`: operaciones concurrentes sobre el mismo
+    producto y ubicación toman tramos distintos en lugar de esperarse. Si las
+    filas bloqueadas no alcanzan, el faltante se atribuye a otra transacción
+    (`StockContentionError`, reintentable): una segunda suma sin lock
+    leería la misma instantánea (REPEATABLE READ) y no aportaría
+    información. Al reintentar, la validación previa detecta si el stock
+    realmente se consumió.
+
+    Args:
+        product (Product): Producto a consumir.
+        from_location (StorageLocation): Ubicación origen.
+        quantity (int): Cantidad requerida.
+
+    Returns:
+        list[dict]: Filas (`FEFO_FIELDS`) ordenadas por vencimiento e id.
+
+    Raises:
+        ValidationError: Si no hay stock o no alcanza para `quantity`.
+        StockContentionError: Si las filas bloqueadas no alcanzan para `quantity`.
+    """
+    origin_qs = InventoryRecord.objects.filter(
+        product=product, location=from_location, quantity__gt=0)
+
+    available = origin_qs.aggregate(total=models.Sum("quantity"))["total"] or 0
+    if available < quantity:
+        raise _stock_shortage_error(from_location, available)
+
+    # Una sola consulta trae solo las filas consumibles (cantidad > 0) con
+    # las columnas que usa el plan; el total se calcula sobre esas filas
+    rows = list(
+        origin_qs.select_for_update(skip_locked=True)
+        .order_by("expiry_date", "id")
+        .values(*FEFO_FIELDS)
+    )
+    locked = sum(row["quantity"] for row in rows)
+    if locked < quantity:
+        raise StockContentionError(
+            f"Stock en uso por otra operación en {from_location.name} "
+            f"(disponibles {locked} de {quantity}), reintente.")
+    return rows
+
+
+def _plan_fefo(rows, quantity):
+    """
+    Planifica el consumo FEFO de `quantity` unidades sobre registros ya bloqueados.
+
+    Recorre las filas en orden tomando de cada una `min(cantidad, pendiente)`
+    hasta cubrir `quantity`; las filas sin stock (cantidad <= 0) se omiten.
+
+    Args:
+        rows (list[dict]): Filas origen (`FEFO_FIELDS`) ordenadas por vencimiento.
+        quantity (int): Cantidad total a consumir.
+
+    Returns:
+        list[tuple[dict, int]]: Fila y cantidad a tomar de cada una.
+
+    Raises:
+        ValidationError: Si los registros no alcanzan para cubrir `quantity`.
+    """
+    plan = []
+    remaining = quantity
+    for row in rows:
+        if remaining <= 0:
+            break
+        if row["quantity"] <= 0:
+            continue
+        take = min(row["quantity"], remaining)
+        plan.append((row, take))
+        remaining -= take
+
+    if remaining > 0:
+        raise exceptions.ValidationError("Stock insuficiente (carrera).")
+    return plan
+
+
+def _apply_fefo_plan(plan, user):
+    """
+    Descuenta del origen las cantidades planificadas con un UPDATE y un DELETE en lote.
+
+    Los registros están bloqueados por SELECT FOR UPDATE, así que la cantidad
+    resultante se calcula en Python: los que quedan en cero se eliminan y el
+    resto se actualiza con un único `bulk_update`.
+
+    Args:
+        plan (list[tuple[dict, int]]): Resultado de `_plan_fefo`.
+        user (CustomUser): Usuario que ejecuta la operación.
+    """
+    now = timezone.now()
+    to_update = []
+    zero_pks = []
+    for row, take in plan:
+        new_quantity = row["quantity"] - take
+        if new_quantity == 0:
+            zero_pks.append(row["pk"])
+        else:
+            to_update.append(InventoryRecord(
+                pk=row["pk"], quantity=new_quantity, updated_by=user, updated_at=now))
+    if to_update:
+        InventoryRecord.objects.bulk_update(
+            to_update, ["quantity", "updated_by", "updated_at"],
+            batch_size=INVENTORY_BULK_BATCH)
+    if zero_pks:
+        InventoryRecord.objects.filter(pk__in=zero_pks).delete()
+
+
+def _normalize_return_entry(quantity, expiry_date, batch_code):
+    """
+    Valida una entrada por devolución y normaliza su lote y vencimiento.
+
+    Args:
+        quantity (int): Cantidad ingresada, debe ser > 0.
+        expiry_date (date | None): Fecha de vencimiento del lote.
+        batch_code (str | None): Código de lote del producto.
+
+    Returns:
+        tuple[str, date]: `(batch_code, expiry_date)` con los centinelas del
+            modelo cuando no se informan.
+
+    Raises:
+        ValidationError: Si la cantidad no es un entero positivo, si
+            `expiry_date` no es date o si lote y vencimiento no van juntos.
+    """
+    if not isinstance(quantity, int) or quantity <= 0:
+        raise exceptions.ValidationError("La cantidad debe ser un entero > 0.")
+    if expiry_date is not None:
+        if not isinstance(expiry_date, date):
+            raise exceptions.ValidationError(
+                "expiry_date debe ser date o None.")
+
+    # Normalización de batch_code: usar el valor por defecto del modelo cuando no se informa
+    norm_batch = (batch_code or "").strip() or "__NULL__"
+    norm_batch = norm_batch.upper()
+    # Normalizar expiry_date a la fecha centinela del modelo cuando no se informa
+    norm_exp = expiry_date if expiry_date is not None else date(9999, 12, 31)
+
+    # Coherencia: si se usa '__NULL__' como batch, expiry_date debe ser None (parámetro original)
+    if (norm_batch == "__NULL__") != (expiry_date is None):
+        raise exceptions.ValidationError(
+            "Debe informar 'batch_code' y 'expiry_date' juntos, o ninguno."
+        )
+    return norm_batch, norm_exp
+
+
+def _add_to_inventory_records(incoming, user):
+    """
+    Suma cantidades a registros de inventario de varias claves en lote.
+
+    Primero asegura que existan todos los registros con un upsert
+    (`bulk_create(update_conflicts=True)`) que inserta los faltantes con
+    cantidad 0 y, si ya existen (incluso creados en paralelo), no los modifica
+    más que en `updated_by`. Luego un SELECT FOR UPDATE por lote de
+    `INVENTORY_BULK_BATCH` claves bloquea exactamente esos registros, con su
+    id también en MySQL, y un `bulk_update` escribe la cantidad final. No se
+    maneja IntegrityError.
+
+    Args:
+        incoming (dict[tuple[int, int, str, date], int]): Cantidad a sumar por
+            `(product_id, location_id, batch_code, expiry_date)`.
+        user (CustomUser): Usuario que ejecuta la operación.
+
+    Returns:
+        dict[tuple[int, int, str, date], InventoryRecord]: Registro final de cada clave.
+    """
+    # MySQL no admite indicar las columnas del conflicto: usa la clave única
+    unique_fields = (
+        ["product", "location", "batch_code", "expiry_date"]
+        if connection.features.supports_update_conflicts_with_target else None
+    )
+    InventoryRecord.objects.bulk_create(
+        [
+            InventoryRecord(
+                product_id=product_id,
+                location_id=location_id,
+                batch_code=batch_code,
+                expiry_date=expiry_date,
+                quantity=0,
+                updated_by=user,
+            )
+            for product_id, location_id, batch_code, expiry_date in incoming
+        ],
+        update_conflicts=True,
+        update_fields=["updated_by"],
+        unique_fields=unique_fields,
+        batch_size=INVENTORY_BULK_BATCH,
+    )
+
+    # Se filtra por las claves exactas (OR de tuplas) para no bloquear
+    # combinaciones ajenas de producto/ubicación/lote/vencimiento
+    keys = list(incoming)
+    records = {}
+    for start in range(0, len(keys), INVENTORY_BULK_BATCH):
+        condition = models.Q()
+        for product_id, location_id, batch_code, expiry_date in keys[start:start + INVENTORY_BULK_BATCH]:
+            condition |= models.Q(
+                product_id=product_id, location_id=location_id,
+                batch_code=batch_code, expiry_date=expiry_date)
+        for record in InventoryRecord.objects.select_for_update().filter(condition):
+            records[(record.product_id, record.location_id,
+                     record.batch_code, record.expiry_date)] = record
+
+    # Los registros están bloqueados: se escribe el valor final
+    now = timezone.now()
+    for key, take in incoming.items():
+        record = records[key]
+        record.quantity += take
+        record.updated_by = user
+        record.updated_at = now
+    InventoryRecord.objects.bulk_update(
+        [records[key] for key in incoming], ["quantity", "updated_by", "updated_at"],
+        batch_size=INVENTORY_BULK_BATCH)
+    return {key: records[key] for key in incoming}
+
 
 @transaction.atomic
 def transference_inventory(
@@ -24,7 +283,9 @@ def transference_inventory(
     la función consume siguiendo un orden FEFO (first-expire, first-out), consolidando en
     destino por la clave compuesta `(product, location, batch_code, expiry_date)`:
     - Si ya existe un `InventoryRecord` en destino con esa combinación, incrementa su cantidad.
-    - Si no existe, crea uno nuevo con cantidad inicial 0 y suma la transferencia.
+    - Si no existe, lo crea con la cantidad transferida.
+    Los registros destino se suman al final con `_add_to_inventory_records`, sin
+    pisar filas creadas en paralelo.
 
     Además, por cada tramo consumido se genera un `InventoryMovement` con `reason=TRANSFER`
     y `reference_type=MANUAL`, dejando traza auditada.
@@ -55,6 +316,8 @@ def transference_inventory(
             - Si no hay stock en el origen.
             - Si el stock total disponible en el origen es menor a `quantity`.
             - Si durante el consumo se detecta inconsistencia por concurrencia (fallback defensivo).
+        StockContentionError: Si el stock alcanza pero parte está bloqueada por
+            otra operación concurrente (reintentable).
     """
     # Validaciones iniciales
     if not isinstance(quantity, int) or quantity <= 0:
@@ -63,77 +326,25 @@ def transference_inventory(
         raise exceptions.ValidationError(
             "Origen y destino no pueden ser iguales.")
 
-    # Buscar IR de los location IR con id from_location y otro con to_location
-    # Selección de IR origen con LOCK (evitar carreras)
-    origin_qs = (
-        InventoryRecord.objects
-        .select_for_update()
-        .filter(product=product, location=from_location)
-    )
-
-    # Producto esta en origin (IR)
-    total = get_total_stock(origin_qs)
-    if total == 0:
-        raise exceptions.ValidationError(
-            f"No hay stock en {from_location.name}.")
-    if total < quantity:
-        raise exceptions.ValidationError(
-            f"Stock insuficiente en {from_location.name}.")
+    # Selección de IR origen con LOCK (evitar carreras), en orden FEFO
+    rows = _lock_fefo_rows(product, from_location, quantity)
 
-    # Obtenemos la existencia de batch_code y de expiry_date
-    # Enfoque FEFO: ordenar por expiry_date asc, luego id
-    rows = list(origin_qs.order_by("expiry_date", "id"))  # Enfoque FEFO
+    # Fase 1: planificar el consumo FEFO en Python, sin escribir
+    plan = _plan_fefo(rows, quantity)
 
-    # cantidad de stock solicitado para la transferencia
-    remaining = quantity
-    i = 0
+    # Fase 2: aplicar el plan con operaciones en lote
+    _apply_fefo_plan(plan, user)
+    incoming = {}
     movements = []
-
-    # Consumir del origen en orden FEFO, acumulando hacia destino
-    while remaining > 0:
-        while i < len(rows) and rows[i].quantity <= 0:
-            i += 1
-        if i == len(rows):
-            raise exceptions.ValidationError("Stock insuficiente (carrera).")
-
-        ir_from = rows[i]
-        take = min(ir_from.quantity, remaining)
-
-        # Destino con misma composite key (product, to_location, batch, expiry)
-        ir_to, created = (
-            InventoryRecord.objects
-            .select_for_update()
-            .get_or_create(
-                product=product,
-                location=to_location,
-                batch_code=ir_from.batch_code,
-                expiry_date=ir_from.expiry_date,
-                defaults={"quantity": 0, "updated_by": user},
-            ))
-
-        # Sumamos el quantity a el destino
-        ir_to.quantity = models.F("quantity") + take
-        ir_to.updated_by = user
-        ir_to.save(update_fields=[
-            "quantity", "updated_by", "updated_at"])
-        ir_to.refresh_from_db(fields=["quantity"])
-
-        # Restamos el quantity al origen
-        ir_from.quantity = models.F("quantity") - take
-        ir_from.updated_by = user
-        ir_from.save(update_fields=[
-            "quantity", "updated_by", "updated_at"])
-        ir_from.refresh_from_db(fields=["quantity"])
-        # Preguntamos si al restar al origen ese stock = 0
-        if ir_from.quantity == 0:
-            # Eliminamos el registro origen
-            ir_from.delete()
-
-        # Registrar movimiento
+    for ir_from, take in plan:
+        # Acumular hacia el destino con la misma clave (batch, expiry)
+        key = (product.pk, to_location.pk,
+               ir_from["batch_code"], ir_from["expiry_date"])
+        incoming[key] = incoming.get(key, 0) + take
         movements.append(InventoryMovement(
             product=product,
-            batch_code=ir_from.batch_code,
-            expiry_date=ir_from.expiry_date,
+            batch_code=ir_from["batch_code"],
+            expiry_date=ir_from["expiry_date"],
             from_location=from_location,
             to_location=to_location,
             quantity=take,
@@ -144,9 +355,10 @@ def transference_inventory(
             created_by=user,
             updated_by=user,
         ))
-        remaining -= take
 
-    InventoryMovement.objects.bulk_create(movements)
+    _add_to_inventory_records(incoming, user)
+    InventoryMovement.objects.bulk_create(
+        movements, batch_size=INVENTORY_BULK_BATCH)
     return {
         "success": True,
         "message": f"Transferencia completada: {quantity} unidades de {product.name} desde {from_location.name} hacia {to_location.name}.",
@@ -163,7 +375,7 @@ def transference_inventory(
 @transaction.atomic
 def purchase_entry_inventory(
         product: Product, to_location: StorageLocation, expiry_date: date | None, batch_code: str | None,
-        description: str, quantity: int, reference_id: int, user: CustomUser):
+        description: str, quantity: int, reference_id: int, user: CustomUser, commit: bool = True):
     """
     Registra una ENTRADA de inventario asociada a una compra a proveedores.
 
@@ -182,6 +394,8 @@ def purchase_entry_inventory(
         quantity (int): Cantidad a ingresar. Debe ser mayor a 0.
         reference_id (int): ID de la compra que origina la entrada.
         user (CustomUser): Usuario que realiza la operación.
+        commit (bool): Si es False, el movimiento se devuelve sin guardar para que
+            el llamador lo inserte con `bulk_create` junto a otros (por defecto True).
 
     Returns:
         dict: Respuesta estándar con información de la operación
@@ -189,6 +403,7 @@ def purchase_entry_inventory(
             - message (str): Mensaje descriptivo de la operación
             - data (dict): Datos de la operación
                 - inventory (InventoryRecord): Registro de inventario actualizado o creado
+                - movement (InventoryMovement): Movimiento generado (sin guardar si commit=False)
                 - quantity_added (int): Cantidad agregada
                 - location (str): Ubicación de almacenamiento
 
@@ -223,12 +438,12 @@ def purchase_entry_inventory(
 
     # Verifica si existe un registro con el mismo batch_code y  expiry_date
     if inventory_record:
-        # Modificamos ese registro coincidente
-        inventory_record.quantity = models.F("quantity") + quantity
+        # Modificamos ese registro coincidente. La fila está bloqueada, así
+        # que se escribe el valor final sin F() ni volver a leerla
+        inventory_record.quantity += quantity
         inventory_record.updated_by = user
         inventory_record.save(
             update_fields=["quantity", "updated_by", "updated_at"])
-        inventory_record.refresh_from_db(fields=["quantity"])
     else:
         # Creamos registro nuevo si no se encontró coincidencia
         inventory_record = InventoryRecord.objects.create(
@@ -242,7 +457,7 @@ def purchase_entry_inventory(
 
     # Registrar movimiento
     # Movimiento: entrada por compra → from=None, to=to_location
-    InventoryMovement.objects.create(
+    movement = InventoryMovement(
         product=product,
         batch_code=norm_batch,
         expiry_date=norm_expiry,
@@ -256,12 +471,15 @@ def purchase_entry_inventory(
         created_by=user,
         updated_by=user,
     )
+    if commit:
+        movement.save(force_insert=True)
 
     return {
         "success": True,
         "message": f"Entrada de compra registrada: {quantity} unidades de {product.name} en {to_location.name}.",
         "data": {
             "inventory": inventory_record,
+            "movement": movement,
             "quantity_added": quantity,
             "location": to_location.name,
             "product": product.name
@@ -311,62 +529,26 @@ def exit_sale_inventory(
             - Si no hay stock en el origen.
             - Si el stock total disponible es menor a `quantity`.
             - Si ocurre inconsistencia por concurrencia durante el consumo.
+        StockContentionError: Si el stock alcanza pero parte está bloqueada por
+            otra operación concurrente (reintentable).
 
     """
     # Validaciones iniciales
     if not isinstance(quantity, int) or quantity <= 0:
         raise exceptions.ValidationError("La cantidad debe ser un entero > 0.")
-    # Buscar IR
-    # Selección de IR origen con LOCK (evitar carreras)
-    origin_qs = (
-        InventoryRecord.objects
-        .select_for_update()
-        .filter(product=product, location=from_location)
-    )
-
-    # Producto esta en el (IR)
-    total = get_total_stock(origin_qs)
-    if total == 0:
-        raise exceptions.ValidationError(
-            f"No hay stock en {from_location.name}.")
-    if total < quantity:
-        raise exceptions.ValidationError(
-            f"Stock insuficiente en {from_location.name}.")
-
-    # Obtenemos la existencia de batch_code y de expiry_date
-    # Enfoque FEFO: ordenar por expiry_date asc, luego id
-    rows = list(origin_qs.order_by("expiry_date", "id"))  # Enfoque FEFO
-
-    # cantidad de stock solicitado para la salida de venta
-    remaining = quantity
-    i = 0
-    movements = []
-
-    # Consumir en orden FEFO
-    while remaining > 0:
-        while i < len(rows) and rows[i].quantity <= 0:
-            i += 1
-        if i == len(rows):
-            raise exceptions.ValidationError("Stock insuficiente (carrera).")
+    # Selección de IR origen con LOCK (evitar carreras), en orden FEFO
+    rows = _lock_fefo_rows(product, from_location, quantity)
 
-        ir_from = rows[i]
-        take = min(ir_from.quantity, remaining)
+    # Fase 1: planificar el consumo FEFO en Python, sin escribir
+    plan = _plan_fefo(rows, quantity)
 
-        # Restamos el quantity según lo indica la compra
-        InventoryRecord.objects.filter(pk=ir_from.pk).update(
-            quantity=models.F("quantity") - take,
-            updated_by=user,
-        )
-        ir_from.refresh_from_db(fields=["quantity"])
-        # Preguntamos si al restar, ese stock = 0
-        if ir_from.quantity == 0:
-            # Eliminamos el registro con stock vació
-            ir_from.delete()
-        # Registrar movimiento
-        movements.append(InventoryMovement(
+    # Fase 2: aplicar el plan con operaciones en lote
+    _apply_fefo_plan(plan, user)
+    movements = [
+        InventoryMovement(
             product=product,
-            batch_code=ir_from.batch_code,
-            expiry_date=ir_from.expiry_date,
+            batch_code=ir_from["batch_code"],
+            expiry_date=ir_from["expiry_date"],
             from_location=from_location,
             to_location=None,
             quantity=take,
@@ -376,10 +558,12 @@ def exit_sale_inventory(
             reference_id=reference_id,
             created_by=user,
             updated_by=user,
-        ))
-        remaining -= take
+        )
+        for ir_from, take in plan
+    ]
 
-    InventoryMovement.objects.bulk_create(movements)
+    InventoryMovement.objects.bulk_create(
+        movements, batch_size=INVENTORY_BULK_BATCH)
     return {
         "success": True,
         "message": f"Salida por venta registrada: {quantity} unidades de {product.name} desde {from_location.name}.",
@@ -400,6 +584,7 @@ def adjustment_inventory(
     modify_expiry_date: date | None,
     modify_batch_code: str | None,
     modify_location: StorageLocation | None,
+    commit: bool = True,
 ):
     """
     Realiza un ajuste de inventario en un `InventoryRecord` existente, permitiendo:
@@ -435,6 +620,8 @@ def adjustment_inventory(
         modify_batch_code (str | None): Nuevo código de lote (solo si `adjusted_other=True`).
         modify_location (StorageLocation | None): Nueva ubicación de almacenamiento
             (solo si `adjusted_other=True`).
+        commit (bool): Si es False, el movimiento se devuelve sin guardar para que
+            el llamador lo inserte con `bulk_create` junto a otros (por defecto True).
 
     Raises:
         ValidationError:
@@ -443,7 +630,8 @@ def adjustment_inventory(
             - Si se informa solo uno de `batch_code` o `expiry_date`.
             - Si más de una bandera (`aggregate`, `remove`, `adjusted_other`) está activa,
               o si ninguna lo está.
-            - Si `modify_location` no existe en base de datos.
+            - Si se informan campos `modify_*` sin `adjusted_other`.
+            - Si `modify_location` no es una instancia guardada en base de datos.
 
     Returns:
         dict: Respuesta estándar con información de la operación
@@ -451,7 +639,7 @@ def adjustment_inventory(
             - message (str): Mensaje descriptivo de la operación
             - data (dict): Datos de la operación
                 - inventory (InventoryRecord): Registro actualizado tras el ajuste
-                - movement (InventoryMovement): Movimiento de inventario generado
+                - movement (InventoryMovement): Movimiento de inventario generado (sin guardar si commit=False)
                 - adjustment_type (str): Tipo de ajuste realizado
                 - quantity_adjusted (int): Cantidad ajustada
     """
@@ -465,11 +653,17 @@ def adjustment_inventory(
     norm_batch = (batch_code or "").strip() or "__NULL__"
     norm_batch = norm_batch.upper()
 
-    # Validación: exactamente una opción debe estar activa
-    options_count = sum([bool(aggregate), bool(remove), bool(adjusted_other)])
-    if options_count != 1:
+    # Validación: exactamente una opción activa (un único bit en la máscara)
+    option = (bool(aggregate) * _ADJUST_AGGREGATE
+              | bool(remove) * _ADJUST_REMOVE
+              | bool(adjusted_other) * _ADJUST_OTHER)
+    if option == 0 or option & (option - 1):
         raise exceptions.ValidationError(
             "Debe elegir exactamente una opción: Agregar, Quitar o Ajustar Otro.")
+    if option != _ADJUST_OTHER and any(
+            (modify_expiry_date, modify_batch_code, modify_location)):
+        raise exceptions.ValidationError(
+            "Los campos modify_* solo aplican a la opción Ajustar Otro.")
 
     # Validar coherencia: si se usa __NULL__ como batch, expiry_date debe ser la fecha centinela
     if (norm_batch == "__NULL__") != (expiry_date is None):
@@ -494,20 +688,23 @@ def adjustment_inventory(
         update_fields = ["quantity", "updated_by", "updated_at"]
         adjustment_type = ""  # Inicializar para evitar errores de referencia
 
+        # Cantidad final: la fila está bloqueada, se calcula sin releerla
+        new_quantity = inventory_record.quantity
+
         # Aplicar modificaciones según la operación
-        if aggregate:
-            inventory_record.quantity = models.F("quantity") + quantity
+        if option == _ADJUST_AGGREGATE:
+            new_quantity += quantity
             adjustment_type = "Agregar"
-        elif remove:
-            # Validar stock suficiente antes de la operación
-            inventory_record.refresh_from_db(fields=["quantity"])
+        elif option == _ADJUST_REMOVE:
+            # Validar stock suficiente antes de la operación (la fila se leyó
+            # con SELECT FOR UPDATE, su cantidad ya es la vigente)
             if inventory_record.quantity < quantity:
                 raise exceptions.ValidationError(
                     f"Stock insuficiente. Disponible: {inventory_record.quantity}, "
                     f"solicitado: {quantity}")
-            inventory_record.quantity = models.F("quantity") - quantity
+            new_quantity -= quantity
             adjustment_type = "Quitar"
-        elif adjusted_other:
+        elif option == _ADJUST_OTHER:
             # Operaciones de ajuste con modificaciones adicionales
             if modify_expiry_date:
                 inventory_record.expiry_date = modify_expiry_date
@@ -516,36 +713,35 @@ def adjustment_inventory(
                 inventory_record.batch_code = modify_batch_code
                 update_fields.append("batch_code")
             if modify_location:
-                storage_exists = StorageLocation.objects.filter(
-                    pk=modify_location.pk).exists()
-                if storage_exists:
-                    inventory_record.location = modify_location
-                    update_fields.append("location")
-                else:
+                # La vista resuelve la ubicación con select_movement_targets;
+                # basta con descartar instancias que nunca se guardaron.
+                if modify_location.pk is None or modify_location._state.adding:
                     raise exceptions.ValidationError(
                         f"La ubicación seleccionada '{modify_location}' no existe")
+                inventory_record.location = modify_location
+                update_fields.append("location")
             adjustment_type = "Ajustar Otro"
 
+        inventory_record.quantity = new_quantity
         inventory_record.updated_by = user
         inventory_record.save(update_fields=update_fields)
-        inventory_record.refresh_from_db(fields=["quantity"])
 
-        movement = InventoryMovement.objects.create(
+        movement = InventoryMovement(
             product=product,
             batch_code=modify_batch_code if modify_batch_code else norm_batch,
             expiry_date=modify_expiry_date if modify_expiry_date else expiry_date,
             from_location=from_location,
             to_location=modify_location if modify_location else None,
             quantity=quantity,
-            reason=(InventoryMovement.Reason.RETURN_ENTRY
-                    if hasattr(InventoryMovement.Reason, "RETURN_ENTRY")
-                    else InventoryMovement.Reason.ADJUSTMENT),
+            reason=InventoryMovement.Reason.RETURN_ENTRY,
             description=description,
             reference_type=InventoryMovement.RefType.MANUAL,
             reference_id=reference_id,
             created_by=user,
             updated_by=user,
         )
+        if commit:
+            movement.save(force_insert=True)
 
         return {
             "success": True,
@@ -569,7 +765,7 @@ def adjustment_inventory(
 @transaction.atomic
 def return_output_inventory(
     product: Product, from_location: StorageLocation, expiry_date: date | None, batch_code: str | None,
-    description: str, quantity: int, reference_id: int, user: CustomUser
+    description: str, quantity: int, reference_id: int, user: CustomUser, commit: bool = True
 ):
     """
     Registra una SALIDA de inventario desde una ubicación específica, asociada a una devolución o ajuste manual.
@@ -588,6 +784,8 @@ def return_output_inventory(
         quantity (int): Cantidad a retirar. Debe ser > 0.
         reference_id (int): Identificador de la referencia externa (ej. devolución o ajuste).
         user (CustomUser): Usuario que realiza la operación.
+        commit (bool): Si es False, el movimiento se devuelve sin guardar para que
+            el llamador lo inserte con `bulk_create` junto a otros (por defecto True).
 
     Returns:
         dict: Respuesta estándar con información de la operación
@@ -595,7 +793,7 @@ def return_output_inventory(
             - message (str): Mensaje descriptivo de la operación
             - data (dict): Datos de la operación
                 - inventory (InventoryRecord): Registro de inventario actualizado
-                - movement (InventoryMovement): Movimiento de inventario generado
+                - movement (InventoryMovement): Movimiento de inventario generado (sin guardar si commit=False)
                 - quantity_removed (int): Cantidad retirada
                 - location (str): Ubicación origen
 
@@ -642,42 +840,36 @@ def return_output_inventory(
             f"producto={product.pk} lote={match_batch} vence={match_exp}."
         )
 
-    # Modificamos ese registro coincidente
-    updated = (
-        InventoryRecord.objects.filter(
-            pk=inventory_record.pk, quantity__gte=quantity
-        ).update(
-            quantity=models.F("quantity") - quantity,
-            updated_by=user
-        )
-    )
-    if updated == 0:
-        inventory_record.refresh_from_db(fields=["quantity"])
+    # Modificamos ese registro coincidente. La fila está bloqueada: la
+    # cantidad leída es la vigente y se escribe el valor final sin F()
+    if inventory_record.quantity < quantity:
         raise exceptions.ValidationError(
             f"Stock insuficiente para producto={product.pk} "
             f"(disp={inventory_record.quantity}, req={quantity}) en '{from_location.name}' "
             f"(lote={match_batch}, vence={match_exp})."
         )
+    inventory_record.quantity -= quantity
+    inventory_record.updated_by = user
+    inventory_record.save(update_fields=["quantity", "updated_by", "updated_at"])
 
     # Registrar movimiento
     # Movimiento: salida por devolución → from=from_location, to=None
-    movement = InventoryMovement.objects.create(
+    movement = InventoryMovement(
         product=product,
         batch_code=match_batch,
         expiry_date=match_exp,
         from_location=from_location,
         to_location=None,
         quantity=quantity,
-        reason=(InventoryMovement.Reason.RETURN_OUTPUT
-                if hasattr(InventoryMovement.Reason, "RETURN_OUTPUT")
-                else InventoryMovement.Reason.ADJUSTMENT),
+        reason=InventoryMovement.Reason.RETURN_OUTPUT,
         description=description,
         reference_type=InventoryMovement.RefType.MANUAL,
         reference_id=reference_id,
         created_by=user,
         updated_by=user,
     )
-    inventory_record.refresh_from_db(fields=["quantity"])
+    if commit:
+        movement.save(force_insert=True)
 
     return {
         "success": True,
@@ -692,10 +884,9 @@ def return_output_inventory(
     }
 
 
-@transaction.atomic
 def return_entry_inventory(
     product: Product, to_location: StorageLocation, expiry_date: date | None, batch_code: str | None,
-    description: str, quantity: int, reference_id: int, user: CustomUser
+    description: str, quantity: int, reference_id: int, user: CustomUser, commit: bool = True
 ):
     """
      Registra una ENTRADA de inventario (ej. devolución o ajuste) en una ubicación específica.
@@ -704,8 +895,9 @@ def return_entry_inventory(
     - El inventario se gestiona por producto, ubicación y opcionalmente por lote/fecha de vencimiento.
     - Se exige consistencia: 'batch_code' y 'expiry_date' deben informarse juntos o no informarse.
     - Si el registro de inventario (InventoryRecord) ya existe, incrementa la cantidad.
-    - Si no existe, crea un nuevo registro de inventario (manejando concurrencia con transacción y 
-      posible reintento en caso de condición de carrera).
+    - Si no existe, crea un nuevo registro de inventario (con un upsert, de modo que una
+      creación concurrente del mismo registro no falla).
+    - Delega en `return_entry_inventory_bulk` con una única entrada.
     - Todo cambio de stock genera un movimiento de inventario (InventoryMovement) con motivo RETURN_ENTRY.
 
     Args:
@@ -717,6 +909,8 @@ def return_entry_inventory(
         quantity (int): Cantidad ingresada, debe ser > 0.
         reference_id (int): Identificador de referencia externa (ejemplo: devolución, ajuste).
         user (CustomUser): Usuario que ejecuta la operación.
+        commit (bool): Si es False, el movimiento se devuelve sin guardar para que
+            el llamador lo inserte con `bulk_create` junto a otros (por defecto True).
 
     Returns:
         dict: Respuesta estándar con información de la operación
@@ -724,7 +918,7 @@ def return_entry_inventory(
             - message (str): Mensaje descriptivo de la operación
             - data (dict): Datos de la operación
                 - inventory (InventoryRecord): Registro de inventario creado o actualizado
-                - movement (InventoryMovement): Movimiento de inventario generado
+                - movement (InventoryMovement): Movimiento de inventario generado (sin guardar si commit=False)
                 - quantity_added (int): Cantidad agregada
                 - location (str): Ubicación destino
 
@@ -734,102 +928,102 @@ def return_entry_inventory(
             - Si expiry_date no es un date válido o es inconsistente con batch_code.
             - Si se informa solo uno de los campos batch_code/expiry_date.
     """
-    # Validaciones iniciales
-    if not isinstance(quantity, int) or quantity <= 0:
-        raise exceptions.ValidationError("La cantidad debe ser un entero > 0.")
-    if expiry_date is not None:
-        if not isinstance(expiry_date, date):
-            raise exceptions.ValidationError(
-                "expiry_date debe ser date o None.")
+    result = return_entry_inventory_bulk([{
+        "product": product,
+        "to_location": to_location,
+        "expiry_date": expiry_date,
+        "batch_code": batch_code,
+        "description": description,
+        "quantity": quantity,
+        "reference_id": reference_id,
+    }], user=user, commit=commit)
+    inventory_record = result["data"]["inventories"][0]
 
-    # Normalización de batch_code: usar el valor por defecto del modelo cuando no se informa
-    norm_batch = (batch_code or "").strip() or "__NULL__"
-    norm_batch = norm_batch.upper()
-    # Normalizar expiry_date a la fecha centinela del modelo cuando no se informa
-    norm_exp = expiry_date if expiry_date is not None else date(9999, 12, 31)
+    return {
+        "success": True,
+        "message": f"Entrada por devolución registrada: {quantity} unidades de {product.name} en {to_location.name}.",
+        "data": {
+            "inventory": inventory_record,
+            "movement": result["data"]["movements"][0],
+            "quantity_added": quantity,
+            "location": to_location.name,
+            "product": product.name
+        }
+    }
 
-    # Coherencia: si se usa '__NULL__' como batch, expiry_date debe ser None (parámetro original)
-    if (norm_batch == "__NULL__") != (expiry_date is None):
-        raise exceptions.ValidationError(
-            "Debe informar 'batch_code' y 'expiry_date' juntos, o ninguno."
-        )
 
-    # Buscar IR
-    # Selección de IR origen con LOCK (evitar carreras)
-    base_qs = (
-        InventoryRecord.objects
-        .select_for_update()
-        .filter(product=product, location=to_location)
-    )
-    # Verificar si poseen batch_code and expiry_date usando los valores normalizados
-    match_batch = norm_batch
-    match_exp = norm_exp
+@transaction.atomic
+def return_entry_inventory_bulk(entries: list[dict], user: CustomUser, commit: bool = True):
+    """
+    Registra varias ENTRADAS por devolución en una sola transacción.
 
-    inventory_record = base_qs.filter(
-        batch_code=match_batch, expiry_date=match_exp).first()
-    if inventory_record:
-        # Modificamos ese registro coincidente
-        # SUMA sin condición gte
-        inventory_record.quantity = models.F("quantity") + quantity
-        inventory_record.updated_by = user
-        inventory_record.save(
-            update_fields=["quantity", "updated_by", "updated_at"])
-        inventory_record.refresh_from_db(fields=["quantity"])
-    else:
+    Aplica las mismas reglas que `return_entry_inventory`, pero con un número
+    de consultas que no crece con la cantidad de entradas: un SELECT FOR UPDATE
+    de los registros existentes, un `bulk_update`, un `bulk_create` de los
+    registros nuevos y un `bulk_create` de los movimientos. Las entradas que
+    comparten producto, ubicación, lote y vencimiento se acumulan sobre el
+    mismo registro.
 
-        from django.db import IntegrityError
-        # Usar un atomic anidado (savepoint) para manejar IntegrityError sin romper
-        # la transacción externa. Si el create falla por concurrencia, hacemos fallback.
-        try:
-            with transaction.atomic():
-                inventory_record = InventoryRecord.objects.create(
-                    product=product,
-                    location=to_location,
-                    batch_code=match_batch,
-                    expiry_date=match_exp,
-                    quantity=quantity,
-                    updated_by=user,
-                )
-        except IntegrityError:
-            # Reintento: alguien lo creó entre tu select_for_update y el create.
-            inventory_record = InventoryRecord.objects.get(
-                product=product, location=to_location,
-                batch_code=match_batch, expiry_date=match_exp
-            )
-            inventory_record.quantity = models.F("quantity") + quantity
-            inventory_record.updated_by = user
-            inventory_record.save(
-                update_fields=["quantity", "updated_by", "updated_at"])
-            inventory_record.refresh_from_db(fields=["quantity"])
+    Args:
+        entries (list[dict]): Entradas con las claves `product`, `to_location`,
+            `expiry_date`, `batch_code`, `description`, `quantity` y `reference_id`.
+        user (CustomUser): Usuario que ejecuta la operación.
+        commit (bool): Si es False, los movimientos se devuelven sin guardar
+            (por defecto True).
+
+    Returns:
+        dict: Respuesta estándar con información de la operación
+            - success (bool): True si la operación fue exitosa
+            - message (str): Mensaje descriptivo de la operación
+            - data (dict): Datos de la operación
+                - inventories (list[InventoryRecord]): Registro final de cada entrada, en orden
+                - movements (list[InventoryMovement]): Movimiento de cada entrada, en orden
+                - quantity_added (int): Cantidad total agregada
+
+    Raises:
+        ValidationError: Si alguna entrada no es válida (ver `return_entry_inventory`).
+    """
+    keys = []
+    incoming = {}
+    for entry in entries:
+        norm_batch, norm_exp = _normalize_return_entry(
+            entry["quantity"], entry.get("expiry_date"), entry.get("batch_code"))
+        key = (entry["product"].pk, entry["to_location"].pk, norm_batch, norm_exp)
+        incoming[key] = incoming.get(key, 0) + entry["quantity"]
+        keys.append(key)
+
+    records = _add_to_inventory_records(incoming, user) if incoming else {}
 
-    # Registrar movimiento
     # Movimiento: entrada por devolución → from=None, to=to_location
-    movement = InventoryMovement.objects.create(
-        product=product,
-        batch_code=match_batch,
-        expiry_date=match_exp,
-        from_location=None,
-        to_location=to_location,
-        quantity=quantity,
-        reason=(InventoryMovement.Reason.RETURN_ENTRY
-                if hasattr(InventoryMovement.Reason, "RETURN_ENTRY")
-                else InventoryMovement.Reason.ADJUSTMENT),
-        description=description,
-        reference_type=InventoryMovement.RefType.MANUAL,
-        reference_id=reference_id,
-        created_by=user,
-        updated_by=user,
-    )
+    movements = [
+        InventoryMovement(
+            product=entry["product"],
+            batch_code=key[2],
+            expiry_date=key[3],
+            from_location=None,
+            to_location=entry["to_location"],
+            quantity=entry["quantity"],
+            reason=InventoryMovement.Reason.RETURN_ENTRY,
+            description=entry.get("description", ""),
+            reference_type=InventoryMovement.RefType.MANUAL,
+            reference_id=entry.get("reference_id"),
+            created_by=user,
+            updated_by=user,
+        )
+        for entry, key in zip(entries, keys)
+    ]
+    if commit:
+        InventoryMovement.objects.bulk_create(
+            movements, batch_size=INVENTORY_BULK_BATCH)
 
+    quantity_added = sum(incoming.values())
     return {
         "success": True,
-        "message": f"Entrada por devolución registrada: {quantity} unidades de {product.name} en {to_location.name}.",
+        "message": f"Entradas por devolución registradas: {len(entries)} ({quantity_added} unidades).",
         "data": {
-            "inventory": inventory_record,
-            "movement": movement,
-            "quantity_added": quantity,
-            "location": to_location.name,
-            "product": product.name
+            "inventories": [records[key] for key in keys],
+            "movements": movements,
+            "quantity_added": quantity_added,
         }
     }
 
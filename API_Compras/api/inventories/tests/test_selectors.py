@@ -23,3 +23,36 @@ def test_list_inventory_records_and_movements():
                                           description='', reference_type=InventoryMovement.RefType.MANUAL)
     mqs = list_inventory_movements()
     assert mqs.count() >= 1
+
+
+@pytest.mark.django_db
+def test_select_movement_targets_batches_locations(django_assert_num_queries):
+    from django.core.exceptions import ValidationError
+    from api.inventories.selectors import select_movement_targets
+    from api.products.models import Product
+    from api.storage_location.models import StorageLocation
+
+    p = Product.objects.create(product_code='P2', name='Prod 2')
+    src = StorageLocation.objects.create(name='Src')
+    dst = StorageLocation.objects.create(name='Dst')
+
+    with django_assert_num_queries(2):
+        product, locations = select_movement_targets(p.id, [src.id, dst.id])
+        assert product.name == 'Prod 2'
+        assert locations[src.id].name == 'Src'
+        assert locations[dst.id].name == 'Dst'
+
+    # Segunda resolución: servida por el cache local del proceso
+    with django_assert_num_queries(0):
+        select_movement_targets(p.id, [src.id, dst.id])
+
+    # Modificar una ubicación vacía el cache (signal post_save)
+    src.name = 'Src renamed'
+    src.save()
+    _, locations = select_movement_targets(p.id, [src.id])
+    assert locations[src.id].name == 'Src renamed'
+
+    with pytest.raises(ValidationError):
+        select_movement_targets(p.id, [src.id, dst.id + 100])
+    with pytest.raises(ValidationError):
+        select_movement_targets(p.id + 100, [src.id])
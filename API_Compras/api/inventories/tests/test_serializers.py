@@ -20,3 +20,70 @@ def test_inventory_record_out_serializer_fields():
     assert data['product'] == rec.product_id
     assert data['location'] == rec.location_id
     assert data['quantity'] == rec.quantity
+
+
+@pytest.mark.django_db
+def test_inventory_record_out_serializer_does_not_load_relations(django_assert_num_queries):
+    from api.inventories.serializers import InventoryRecordOutSerializer
+    from api.inventories.models import InventoryRecord
+    from api.products.models import Product
+    from api.storage_location.models import StorageLocation
+
+    p = Product.objects.create(product_code='PZ', name='Prod Z')
+    loc = StorageLocation.objects.create(name='L3')
+    created = InventoryRecord.objects.create(product=p, location=loc, quantity=3)
+    rec = InventoryRecord.objects.get(pk=created.pk)
+
+    with django_assert_num_queries(0):
+        data = InventoryRecordOutSerializer(rec).data
+
+    assert data['product'] == p.id
+    assert data['location'] == loc.id
+
+
+@pytest.mark.django_db
+def test_inventory_record_details_list_matches_single_serializer():
+    from api.inventories.serializers import InventoryRecordWithDetailsSerializer
+    from api.inventories.services import get_inventory_record
+    from api.inventories.models import InventoryRecord
+    from api.products.models import Product
+    from api.storage_location.models import StorageLocation
+
+    p = Product.objects.create(product_code='PL', name='Prod L')
+    loc = StorageLocation.objects.create(name='LL')
+    InventoryRecord.objects.create(product=p, location=loc, quantity=4)
+    InventoryRecord.objects.create(
+        product=p, location=loc, quantity=6, batch_code='B6')
+
+    rows = get_inventory_record()
+    many = InventoryRecordWithDetailsSerializer(rows, many=True).data
+
+    assert many == [InventoryRecordWithDetailsSerializer(r).data for r in rows]
+    assert len(many) == 2
+    assert {row['record_id'] for row in many} == {r['record'].id for r in rows}
+    assert {row['product_name'] for row in many} == {'Prod L'}
+    assert many[0]['created_at'].endswith('Z')
+    assert (InventoryRecordWithDetailsSerializer.get_field_pipeline()
+            is InventoryRecordWithDetailsSerializer.get_field_pipeline())
+
+
+@pytest.mark.django_db
+def test_inventory_record_out_serializer_formats_dates_like_drf():
+    from datetime import date
+    from rest_framework import serializers
+    from api.inventories.serializers import InventoryRecordOutSerializer
+    from api.inventories.models import InventoryRecord
+    from api.products.models import Product
+    from api.storage_location.models import StorageLocation
+
+    p = Product.objects.create(product_code='PD', name='Prod D')
+    loc = StorageLocation.objects.create(name='LD')
+    rec = InventoryRecord.objects.create(
+        product=p, location=loc, quantity=1, expiry_date=date(2030, 1, 15))
+
+    data = InventoryRecordOutSerializer(rec).data
+
+    assert list(data) == ["id", "product", "location", "quantity",
+                          "batch_code", "expiry_date", "updated_at"]
+    assert data['expiry_date'] == '2030-01-15'
+    assert data['updated_at'] == serializers.DateTimeField().to_representation(rec.updated_at)
@@ -50,6 +50,7 @@ def test_purchase_entry_creates_and_updates_records(product, locations, user):
     # Segunda entrada con el mismo batch -> debe acumular
     res2 = purchase_entry_inventory(product=product, to_location=to_location, expiry_date=None, batch_code=None,
                                     description="Compra2", quantity=3, reference_id=2, user=user)
+    assert res2["data"]["inventory"].quantity == 8
     inv.refresh_from_db()
     assert inv.quantity == 8
 
@@ -74,6 +75,86 @@ def test_transference_happy_path_consumes_and_creates_movements(product, locatio
     # Origen registros actualizados/deleted
     assert InventoryRecord.objects.filter(
         product=product, location=from_loc).count() == 1
+    assert InventoryRecord.objects.get(
+        product=product, location=from_loc, batch_code="B").quantity == 1
+    dest = dict(InventoryRecord.objects.filter(
+        product=product, location=to_loc).values_list("batch_code", "quantity"))
+    assert dest == {"A": 2, "B": 4}
+
+
+@pytest.mark.django_db
+def test_transference_adds_to_existing_destination_record(product, locations, user):
+    from_loc, to_loc = locations
+    InventoryRecord.objects.create(product=product, location=from_loc, quantity=3,
+                                   batch_code="A", expiry_date=date(2025, 12, 1), updated_by=user)
+    InventoryRecord.objects.create(product=product, location=from_loc, quantity=3,
+                                   batch_code="B", expiry_date=date(2026, 1, 1), updated_by=user)
+    existing = InventoryRecord.objects.create(product=product, location=to_loc, quantity=10,
+                                              batch_code="A", expiry_date=date(2025, 12, 1), updated_by=user)
+
+    transference_inventory(product=product, from_location=from_loc, to_location=to_loc,
+                           description="Transf", quantity=5, reference_id=11, user=user)
+
+    existing.refresh_from_db()
+    assert existing.quantity == 13
+    assert InventoryRecord.objects.get(
+        product=product, location=to_loc, batch_code="B").quantity == 2
+    assert InventoryRecord.objects.filter(product=product, location=to_loc).count() == 2
+
+
+@pytest.mark.django_db
+def test_transference_adds_to_destination_record_created_concurrently(product, locations, user, monkeypatch):
+    from django.db.models import QuerySet
+    from_loc, to_loc = locations
+    InventoryRecord.objects.create(product=product, location=from_loc, quantity=5,
+                                   batch_code="A", expiry_date=date(2025, 12, 1), updated_by=user)
+    original_bulk_create = QuerySet.bulk_create
+    concurrent = []
+
+    def bulk_create_after_concurrent_insert(self, objs, *args, **kwargs):
+        objs = list(objs)
+        # Otra transacción crea el registro destino justo antes del upsert
+        if self.model is InventoryRecord and not concurrent:
+            concurrent.append(original_bulk_create(self, [InventoryRecord(
+                product=product, location=to_loc, quantity=7,
+                batch_code="A", expiry_date=date(2025, 12, 1), updated_by=user)]))
+        return original_bulk_create(self, objs, *args, **kwargs)
+    monkeypatch.setattr(QuerySet, "bulk_create", bulk_create_after_concurrent_insert)
+
+    transference_inventory(product=product, from_location=from_loc, to_location=to_loc,
+                           description="Transf", quantity=3, reference_id=12, user=user)
+
+    assert concurrent
+    assert InventoryRecord.objects.get(location=to_loc).quantity == 10
+    assert InventoryRecord.objects.get(location=from_loc).quantity == 2
+
+
+@pytest.mark.django_db
+def test_add_to_inventory_records_locks_only_exact_keys(product, locations, user, monkeypatch):
+    from django.db.models import QuerySet
+    from api.inventories.services import _add_to_inventory_records
+    loc_a, loc_b = locations
+    # Combina valores de ambas claves pedidas pero no es ninguna de ellas
+    cross = InventoryRecord.objects.create(product=product, location=loc_a, quantity=9,
+                                           batch_code="B", expiry_date=date(2026, 1, 1), updated_by=user)
+    original_iter = QuerySet.__iter__
+    locked = []
+
+    def iter_recording_locked_rows(self):
+        for obj in original_iter(self):
+            if self.query.select_for_update:
+                locked.append(obj.pk)
+            yield obj
+    monkeypatch.setattr(QuerySet, "__iter__", iter_recording_locked_rows)
+
+    result = _add_to_inventory_records({
+        (product.pk, loc_a.pk, "A", date(2025, 12, 1)): 2,
+        (product.pk, loc_b.pk, "B", date(2026, 1, 1)): 3,
+    }, user)
+
+    assert sorted(locked) == sorted(record.pk for record in result.values())
+    assert cross.pk not in locked
+    assert InventoryRecord.objects.get(pk=cross.pk).quantity == 9
 
 
 @pytest.mark.django_db
@@ -97,6 +178,46 @@ def test_transference_insufficient_stock_raises(product, locations, user):
                                description="T", quantity=5, reference_id=1, user=user)
 
 
+@pytest.mark.django_db
+def test_transference_locked_stock_raises_contention_and_keeps_shortage_error(product, locations, user, monkeypatch):
+    from django.db.models import QuerySet
+    from api.inventories.services import StockContentionError
+    from_loc, to_loc = locations
+    InventoryRecord.objects.create(product=product, location=from_loc, quantity=4,
+                                   batch_code="A", expiry_date=date(2025, 12, 1), updated_by=user)
+    # Simula que otra transacción tiene bloqueadas todas las filas (SKIP LOCKED)
+    monkeypatch.setattr(QuerySet, "select_for_update",
+                        lambda self, **kwargs: self.none())
+
+    with pytest.raises(StockContentionError) as contention:
+        transference_inventory(product=product, from_location=from_loc, to_location=to_loc,
+                               description="T", quantity=3, reference_id=1, user=user)
+    assert not isinstance(contention.value, exceptions.ValidationError)
+    with pytest.raises(exceptions.ValidationError):
+        exit_sale_inventory(product=product, from_location=from_loc,
+                            description="S", quantity=5, reference_id=1, user=user)
+    assert InventoryRecord.objects.get(location=from_loc).quantity == 4
+
+
+@pytest.mark.django_db
+def test_insufficient_stock_fails_before_locking_origin(product, locations, user, monkeypatch):
+    from django.db.models import QuerySet
+    from_loc, to_loc = locations
+    InventoryRecord.objects.create(product=product, location=from_loc, quantity=2,
+                                   batch_code="A", expiry_date=date(2025, 12, 1), updated_by=user)
+
+    def fail_lock(self, **kwargs):
+        raise AssertionError("select_for_update no debería ejecutarse")
+    monkeypatch.setattr(QuerySet, "select_for_update", fail_lock)
+
+    with pytest.raises(exceptions.ValidationError, match="insuficiente"):
+        exit_sale_inventory(product=product, from_location=from_loc,
+                            description="S", quantity=3, reference_id=1, user=user)
+    with pytest.raises(exceptions.ValidationError, match="No hay stock"):
+        transference_inventory(product=product, from_location=to_loc, to_location=from_loc,
+                               description="T", quantity=1, reference_id=1, user=user)
+
+
 @pytest.mark.django_db
 def test_exit_sale_happy_and_insufficient(product, locations, user):
     from_loc, _ = locations
@@ -113,6 +234,54 @@ def test_exit_sale_happy_and_insufficient(product, locations, user):
                             description="Venta2", quantity=5, reference_id=101, user=user)
 
 
+@pytest.mark.django_db
+def test_exit_sale_query_count_does_not_grow_with_tranches(product, locations, user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from_loc, other_loc = locations
+
+    def run(location, lots, quantity):
+        for n, qty in enumerate(lots):
+            InventoryRecord.objects.create(product=product, location=location, quantity=qty,
+                                           batch_code=f"L{n}", expiry_date=date(2026, 1, n + 1), updated_by=user)
+        with CaptureQueriesContext(connection) as ctx:
+            exit_sale_inventory(product=product, from_location=location,
+                                description="Venta", quantity=quantity, reference_id=1, user=user)
+        return len(ctx.captured_queries)
+
+    two_lots = run(from_loc, [1, 5], 5)
+    four_lots = run(other_loc, [1, 1, 1, 5], 7)
+
+    assert two_lots == four_lots
+    remaining = InventoryRecord.objects.filter(product=product, location=other_loc)
+    assert list(remaining.values_list("batch_code", "quantity")) == [("L3", 1)]
+    assert InventoryMovement.objects.filter(from_location=other_loc).count() == 4
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("flags, modify_batch_code", [
+    ((None, None, None), None),
+    ((True, True, None), None),
+    ((True, None, True), None),
+    ((True, True, True), None),
+    ((True, None, None), "OTHER"),
+])
+def test_adjustment_inventory_rejects_invalid_option_combinations(
+        product, locations, user, flags, modify_batch_code):
+    from_loc, _ = locations
+    InventoryRecord.objects.create(product=product, location=from_loc, quantity=10,
+                                   batch_code="X", expiry_date=date(2025, 12, 31), updated_by=user)
+    aggregate, remove, adjusted_other = flags
+
+    with pytest.raises(exceptions.ValidationError):
+        adjustment_inventory(product=product, from_location=from_loc, expiry_date=date(2025, 12, 31), batch_code="X",
+                             description="Adj", quantity=1, reference_id=1, user=user,
+                             aggregate=aggregate, remove=remove, adjusted_other=adjusted_other,
+                             modify_expiry_date=None, modify_batch_code=modify_batch_code, modify_location=None)
+    assert InventoryRecord.objects.get(
+        product=product, location=from_loc, batch_code="X").quantity == 10
+
+
 @pytest.mark.django_db
 def test_adjustment_inventory_aggregate_remove_and_adjust_other(product, locations, user):
     from_loc, other_loc = locations
@@ -125,6 +294,7 @@ def test_adjustment_inventory_aggregate_remove_and_adjust_other(product, locatio
                                description="Adj", quantity=5, reference_id=200, user=user, aggregate=True, remove=None, adjusted_other=None,
                                modify_expiry_date=None, modify_batch_code=None, modify_location=None)
     assert res["success"]
+    assert res["data"]["inventory"].quantity == 15
     inv = InventoryRecord.objects.get(
         product=product, location=from_loc, batch_code="X")
     assert inv.quantity == 15
@@ -169,6 +339,7 @@ def test_return_output_and_entry_and_get_inventory_record(product, locations, us
     res2 = return_output_inventory(product=product, from_location=to_loc, expiry_date=None, batch_code=None,
                                    description="RetOut", quantity=2, reference_id=301, user=user)
     assert res2["success"]
+    assert res2["data"]["inventory"].quantity == 5
     inv.refresh_from_db()
     assert inv.quantity == 5
 
@@ -180,3 +351,91 @@ def test_return_output_and_entry_and_get_inventory_record(product, locations, us
     with pytest.raises(exceptions.ValidationError):
         return_output_inventory(product=product, from_location=to_loc, expiry_date=None, batch_code=None,
                                 description="RetOut", quantity=20, reference_id=302, user=user)
+
+
+@pytest.mark.parametrize("quantities, quantity, expected", [
+    ([5], 3, [(0, 3)]),
+    ([2, 5], 6, [(0, 2), (1, 4)]),
+    ([0, 2, 0, 3, 9], 5, [(1, 2), (3, 3)]),
+    ([1, 1, 1], 3, [(0, 1), (1, 1), (2, 1)]),
+])
+def test_plan_fefo_takes_in_order_and_skips_empty_rows(quantities, quantity, expected):
+    from api.inventories.services import _plan_fefo
+    rows = [{"pk": n, "quantity": q} for n, q in enumerate(quantities)]
+
+    plan = _plan_fefo(rows, quantity)
+
+    assert [(row["pk"], take) for row, take in plan] == expected
+    assert all(type(take) is int for _, take in plan)
+
+
+@pytest.mark.parametrize("quantities", [[], [0, 0], [1, 2]])
+def test_plan_fefo_raises_when_rows_do_not_cover_quantity(quantities):
+    from api.inventories.services import _plan_fefo
+    rows = [{"pk": n, "quantity": q} for n, q in enumerate(quantities)]
+
+    with pytest.raises(exceptions.ValidationError):
+        _plan_fefo(rows, 4)
+
+
+@pytest.mark.django_db
+def test_entry_services_return_unsaved_movements_when_commit_false(product, locations, user):
+    to_loc, _ = locations
+    results = [
+        purchase_entry_inventory(product=product, to_location=to_loc, expiry_date=None, batch_code=None,
+                                 description="Compra", quantity=2, reference_id=1, user=user, commit=False),
+        return_entry_inventory(product=product, to_location=to_loc, expiry_date=None, batch_code=None,
+                               description="Ret", quantity=3, reference_id=2, user=user, commit=False),
+    ]
+
+    movements = [r["data"]["movement"] for r in results]
+    assert all(m.pk is None for m in movements)
+    assert not InventoryMovement.objects.filter(to_location=to_loc).exists()
+    assert results[1]["data"]["inventory"].quantity == 5
+
+    InventoryMovement.objects.bulk_create(movements)
+    assert InventoryMovement.objects.filter(to_location=to_loc).count() == 2
+
+
+@pytest.mark.django_db
+def test_return_entry_bulk_accumulates_entries_with_constant_queries(product, locations, user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from api.inventories.services import return_entry_inventory_bulk
+    loc_a, loc_b = locations
+    existing = InventoryRecord.objects.create(product=product, location=loc_a, quantity=4,
+                                              batch_code="A", expiry_date=date(2026, 1, 1), updated_by=user)
+
+    def entry(location, quantity, batch_code=None, expiry_date=None):
+        return {"product": product, "to_location": location, "expiry_date": expiry_date,
+                "batch_code": batch_code, "description": "RMA", "quantity": quantity, "reference_id": 7}
+
+    entries = [
+        entry(loc_a, 2, "a", date(2026, 1, 1)),
+        entry(loc_a, 3, "A", date(2026, 1, 1)),
+        entry(loc_b, 5),
+        entry(loc_b, 1),
+    ]
+    with CaptureQueriesContext(connection) as ctx:
+        res = return_entry_inventory_bulk(entries, user=user)
+
+    # Upsert de registros, SELECT FOR UPDATE, UPDATE, INSERT movimientos + savepoint
+    assert len(ctx.captured_queries) == 6
+    existing.refresh_from_db()
+    assert existing.quantity == 9
+    new_record = InventoryRecord.objects.get(location=loc_b)
+    assert (new_record.batch_code, new_record.quantity) == ("__NULL__", 6)
+    assert [r.pk for r in res["data"]["inventories"]] == [existing.pk, existing.pk, new_record.pk, new_record.pk]
+    assert res["data"]["quantity_added"] == 11
+    assert InventoryMovement.objects.filter(
+        reason=InventoryMovement.Reason.RETURN_ENTRY, reference_id=7).count() == 4
+
+    # La entrada individual delega en la versión en lote: un único savepoint
+    with CaptureQueriesContext(connection) as ctx:
+        return_entry_inventory(product=product, to_location=loc_b, expiry_date=None, batch_code=None,
+                               description="RMA", quantity=1, reference_id=8, user=user)
+    assert len(ctx.captured_queries) == 6
+
+    with pytest.raises(exceptions.ValidationError):
+        return_entry_inventory_bulk([entry(loc_a, 1), entry(loc_a, 1, batch_code="X")], user=user)
+    assert InventoryMovement.objects.filter(reference_id=7).count() == 4
@@ -21,6 +21,19 @@ def test_get_total_stock_aggregation():
     assert total == 5
 
 
+def test_parse_iso_date():
+    from datetime import date
+    from django.core.exceptions import ValidationError
+    from api.inventories.utils import parse_iso_date
+
+    assert parse_iso_date("2025-12-31") == date(2025, 12, 31)
+    assert parse_iso_date(date(2025, 1, 2)) == date(2025, 1, 2)
+    assert parse_iso_date(None) is None
+    assert parse_iso_date("") is None
+    with pytest.raises(ValidationError):
+        parse_iso_date("31/12/2025", "expiry_date")
+
+
 @pytest.mark.django_db
 def test_purchase_entry_and_exit_sale_views(monkeypatch):
     from rest_framework.test import APIRequestFactory, force_authenticate
@@ -95,3 +108,29 @@ def test_purchase_entry_and_exit_sale_views(monkeypatch):
     resp2 = views.exit_sale(req2)
     resp2.render()
     assert resp2.status_code == 201
+
+
+@pytest.mark.django_db
+def test_delete_inventory_record_view_serializes_deferred_record():
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from django.contrib.auth import get_user_model
+    from api.inventories import views
+    from api.inventories.models import InventoryRecord
+    from api.products.models import Product
+    from api.storage_location.models import StorageLocation
+
+    admin = get_user_model().objects.create_user(
+        username='deladmin', password='pw', email='deladmin@example.test', is_staff=True)
+    product = Product.objects.create(product_code='DEL1', name='Del')
+    location = StorageLocation.objects.create(name='DelLoc')
+    record = InventoryRecord.objects.create(
+        product=product, location=location, quantity=0)
+
+    req = APIRequestFactory().delete(f'/api/inventories/{record.id}')
+    force_authenticate(req, user=admin)
+    resp = views.delete_inventory_record(req, pk=record.id)
+
+    assert resp.status_code == 200
+    assert resp.data['data']['product'] == product.id
+    assert resp.data['data']['location'] == location.id
+    assert not InventoryRecord.objects.filter(pk=record.id).exists()
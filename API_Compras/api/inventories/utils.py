@@ -1,7 +1,46 @@
+from datetime import date
+from django.core import exceptions
 from django.db import models
+from api.cache import LocalTTLCache
+
+# Cache en memoria del proceso de productos y ubicaciones (solo id y name)
+# usados al registrar movimientos. Las señales de Product/StorageLocation lo
+# vacían en el proceso que escribe; el resto lo ve en <= TTL segundos.
+MOVEMENT_TARGETS_CACHE_TTL = 60
+MOVEMENT_TARGETS_CACHE_MAXSIZE = 512
+movement_targets_cache = LocalTTLCache(
+    maxsize=MOVEMENT_TARGETS_CACHE_MAXSIZE, ttl=MOVEMENT_TARGETS_CACHE_TTL)
 
 
 def get_total_stock(qs):
     stock_data = qs.aggregate(total=models.Sum("quantity"))
     total = stock_data["total"] or 0
     return total
+
+
+def parse_iso_date(value, field: str = "date") -> date | None:
+    """
+    Convierte una fecha ISO-8601 (YYYY-MM-DD) del body en `date`.
+
+    Usa `date.fromisoformat` directamente, sin el despacho por formatos
+    de DateField/parse_date, ya que la API solo documenta el formato ISO.
+
+    Args:
+        value (str | date | None): Valor recibido.
+        field (str): Nombre del campo, para el mensaje de error.
+
+    Returns:
+        date | None: Fecha convertida, o None si no se informó.
+
+    Raises:
+        ValidationError: Si el valor no es una fecha ISO válida.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError(
+            f"{field} debe tener formato YYYY-MM-DD.")
@@ -4,11 +4,12 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from . import services
+from .selectors import list_inventory_records_out, select_movement_targets
+from .utils import parse_iso_date
 from .serializers import (
     InventoryRecordOutSerializer,
     InventoryRecordWithDetailsSerializer
 )
-from .models import InventoryRecord
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAdminUser
 from drf_yasg.utils import swagger_auto_schema
@@ -28,6 +29,32 @@ logger = logging.getLogger(__name__)
 PAGINATION_PAGE_SIZE_IR = 5
 
 
+class InventoryRecordPagination(PageNumberPagination):
+    """Paginador de registros de inventario con el tamaño de página fijado a nivel de clase."""
+    page_size = PAGINATION_PAGE_SIZE_IR
+
+
+def _resolve_movement_targets(data, *location_keys):
+    """
+    Convierte los IDs del body en las instancias que esperan los servicios.
+
+    Args:
+        data (dict): Body del request.
+        *location_keys (str): Claves del body con IDs de ubicación; las
+            ausentes o nulas se devuelven como None.
+
+    Returns:
+        tuple: Producto seguido de una ubicación (o None) por cada clave.
+    """
+    location_ids = [
+        int(data[key]) if data.get(key) is not None else None
+        for key in location_keys
+    ]
+    product, locations = select_movement_targets(
+        int(data["product_id"]), [pk for pk in location_ids if pk is not None])
+    return (product, *(locations.get(pk) for pk in location_ids))
+
+
 def _invalidate_inventory_cache(product_id=None, location_id=None):
     """
     Invalida el cache relacionado con inventario.
@@ -149,12 +176,14 @@ def purchase_entry(request):
     """
     try:
         data = request.data
+        product, location = _resolve_movement_targets(data, "location_id")
         result = services.purchase_entry_inventory(
-            product=data["product_id"],
-            to_location=data["location_id"],
+            product=product,
+            to_location=location,
             quantity=data["quantity"],
             batch_code=data.get("batch_code"),
-            expiry_date=data.get("expiry_date"),
+            expiry_date=parse_iso_date(
+                data.get("expiry_date"), "expiry_date"),
             description=data.get("notes", ""),
             reference_id=data.get("purchase_order_number"),
             user=request.user,
@@ -274,6 +303,7 @@ def purchase_entry(request):
         400: openapi.Response(description="Stock insuficiente o datos inválidos"),
         403: openapi.Response(description="Sin permisos de administrador"),
         404: openapi.Response(description="Producto o ubicación no encontrados"),
+        409: openapi.Response(description="Stock bloqueado por otra operación, reintentar"),
         500: openapi.Response(description="Error interno del servidor")
     },
     tags=inventories_admin()
@@ -307,13 +337,15 @@ def exit_sale(request):
         400: Stock insuficiente, datos inválidos o cantidad inválida
         403: Usuario sin permisos de administrador
         404: Producto o ubicación no encontrados
+        409: Stock bloqueado por otra operación concurrente (reintentable)
         500: Error interno del servidor o fallo en el registro
     """
     try:
         data = request.data
+        product, location = _resolve_movement_targets(data, "location_id")
         result = services.exit_sale_inventory(
-            product=data["product_id"],
-            from_location=data["location_id"],
+            product=product,
+            from_location=location,
             quantity=data["quantity"],
             description=data.get("notes", ""),
             reference_id=data.get("sale_order_number", None),
@@ -337,6 +369,13 @@ def exit_sale(request):
                 "product": result["data"]["product"]
             }
         }, status=status.HTTP_201_CREATED)
+    except services.StockContentionError as e:
+        logger.warning(f"Stock contention processing exit sale: {str(e)}")
+        return Response({
+            "success": False,
+            "message": "Stock in use by another operation, retry",
+            "error": str(e)
+        }, status=status.HTTP_409_CONFLICT)
     except Exception as e:
         logger.error(f"Error processing exit sale: {str(e)}")
         return Response({
@@ -403,6 +442,7 @@ def exit_sale(request):
         400: openapi.Response(description="Stock insuficiente o ubicaciones iguales"),
         403: openapi.Response(description="Sin permisos de administrador"),
         404: openapi.Response(description="Producto o ubicaciones no encontrados"),
+        409: openapi.Response(description="Stock bloqueado por otra operación, reintentar"),
         500: openapi.Response(description="Error interno del servidor")
     },
     tags=inventories_admin()
@@ -437,14 +477,17 @@ def transfer_in(request):
         400: Stock insuficiente en origen, ubicaciones iguales o datos inválidos
         403: Usuario sin permisos de administrador
         404: Producto o ubicaciones no encontrados
+        409: Stock bloqueado por otra operación concurrente (reintentable)
         500: Error interno del servidor o fallo en la transferencia
     """
     try:
         data = request.data
+        product, from_location, to_location = _resolve_movement_targets(
+            data, "from_location_id", "to_location_id")
         result = services.transference_inventory(
-            product=data["product_id"],
-            from_location=data["from_location_id"],
-            to_location=data["to_location_id"],
+            product=product,
+            from_location=from_location,
+            to_location=to_location,
             quantity=data["quantity"],
             description=data.get("notes", ""),
             reference_id=data.get("transfer_reason", None),
@@ -462,6 +505,13 @@ def transfer_in(request):
             }
         }, status=status.HTTP_201_CREATED)
 
+    except services.StockContentionError as e:
+        logger.warning(f"Stock contention processing transfer: {str(e)}")
+        return Response({
+            "success": False,
+            "message": "Stock in use by another operation, retry",
+            "error": str(e)
+        }, status=status.HTTP_409_CONFLICT)
     except Exception as e:
         logger.error(f"Error processing transfer: {str(e)}")
         return Response({
@@ -543,21 +593,25 @@ def adjustment_in(request):
     """
     try:
         data = request.data
+        product, location, modify_location = _resolve_movement_targets(
+            data, "location_id", "modify_location")
         result = services.adjustment_inventory(
-            product=data["product_id"],
-            from_location=data["location_id"],
+            product=product,
+            from_location=location,
             quantity=data["quantity"],
             description=data.get("notes", ""),
             batch_code=data.get("batch_code"),
-            expiry_date=data.get("expiry_date"),
+            expiry_date=parse_iso_date(
+                data.get("expiry_date"), "expiry_date"),
             reference_id=data.get("adjustment_reason", None),
             user=request.user,
             aggregate=data.get("aggregate", None),
             remove=data.get("remove", None),
             adjusted_other=data.get("adjusted_other", None),
-            modify_expiry_date=data.get("modify_expiry_date", None),
+            modify_expiry_date=parse_iso_date(
+                data.get("modify_expiry_date"), "modify_expiry_date"),
             modify_batch_code=data.get("modify_batch_code", None),
-            modify_location=data.get("modify_location", None),
+            modify_location=modify_location,
         )
         logger.info(
             f"Adjustment processed successfully: {result['message']}")
@@ -660,13 +714,15 @@ def return_entry(request):
     """
     try:
         data = request.data
+        product, location = _resolve_movement_targets(data, "location_id")
         result = services.return_entry_inventory(
-            product=data["product_id"],
-            to_location=data["location_id"],
+            product=product,
+            to_location=location,
             quantity=data["quantity"],
             description=data.get("notes", ""),
             batch_code=data.get("batch_code"),
-            expiry_date=data.get("expiry_date"),
+            expiry_date=parse_iso_date(
+                data.get("expiry_date"), "expiry_date"),
             reference_id=data.get("original_sale_id"),
             user=request.user
         )
@@ -771,13 +827,15 @@ def return_output(request):
     """
     try:
         data = request.data
+        product, location = _resolve_movement_targets(data, "location_id")
         result = services.return_output_inventory(
-            product=data["product_id"],
-            from_location=data["location_id"],
+            product=product,
+            from_location=location,
             quantity=data["quantity"],
             description=data.get("notes", ""),
             batch_code=data.get("batch_code"),
-            expiry_date=data.get("expiry_date"),
+            expiry_date=parse_iso_date(
+                data.get("expiry_date"), "expiry_date"),
             reference_id=data.get("original_purchase_id"),
             user=request.user
         )
@@ -940,8 +998,7 @@ def list_inventory_records(request):
         )
 
         # 4 Paginar y serializar
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_IR
+        paginator = InventoryRecordPagination()
         page = paginator.paginate_queryset(inventory_iter, request)
         serializer = InventoryRecordWithDetailsSerializer(page, many=True)
 
@@ -1011,7 +1068,8 @@ def delete_inventory_record(request, pk):
         de los datos de inventario. Usar con precaución.
     """
     try:
-        inventory_record = get_object_or_404(InventoryRecord, pk=pk)
+        # Solo las columnas que usa InventoryRecordOutSerializer
+        inventory_record = get_object_or_404(list_inventory_records_out(), pk=pk)
 
         if inventory_record.quantity is not None and inventory_record.quantity > 0:
             return Response({
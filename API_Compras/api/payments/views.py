@@ -28,6 +28,11 @@ logger = logging.getLogger(__name__)
 PAGINATION_PAGE_SIZE_PAYMENTS = 10
 
 
+class PaymentPagination(PageNumberPagination):
+    """Paginador de pagos con el tamaño de página fijado a nivel de clase."""
+    page_size = PAGINATION_PAGE_SIZE_PAYMENTS
+
+
 class InstallmentViewSet(generics.ListAPIView):
     """
     ViewSet para listar cuotas (Installments) con filtros opcionales.
@@ -588,8 +593,7 @@ def get_all_payments(request):
             f"Pagos obtenidos exitosamente para usuario {request.user.id}")
 
         # Paginate payments list con manejo de errores para tests
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_PAYMENTS
+        paginator = PaymentPagination()
 
         try:
             page_data = paginator.paginate_queryset(payments, request)
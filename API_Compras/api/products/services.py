@@ -222,12 +222,6 @@ def create_products(data: Dict[str, Any], user_id: int) -> Dict[str, Any]:
         ignore_conflicts=False
     )
 
-    for product in created_products_with_ids:
-        product.refresh_from_db()
-
-        if hasattr(product, '_prefetched_objects_cache'):
-            product._prefetched_objects_cache = {}
-
     return {
         "success": True,
         "message": f"Successfully created {len(created_products_with_ids)} products with {total_categories_assigned} category associations",
@@ -380,7 +374,9 @@ def partial_update_product(product_id: int, data: Dict[str, Any], user_id: int)
 
         ProductCategory.objects.filter(product=product).delete()
 
-        categories_for_update = Category.objects.filter(id__in=category_ids)
+        # Solo se usan como destino de la FK: basta con la PK
+        categories_for_update = Category.objects.filter(
+            id__in=category_ids).only("id")
         category_map = {cat.pk: cat for cat in categories_for_update}
 
         product_categories_to_create = []
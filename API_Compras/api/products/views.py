@@ -25,6 +25,11 @@ get_all_products_with_promotions = _get_all_products_with_promotions
 PAGINATION_PAGE_SIZE_PRODUCTS = 25
 
 
+class ProductPagination(PageNumberPagination):
+    """Paginador de productos con el tamaño de página fijado a nivel de clase."""
+    page_size = PAGINATION_PAGE_SIZE_PRODUCTS
+
+
 def _invalidate_product_cache(category_id=None):
     """
     Invalida el cache relacionado con productos.
@@ -165,8 +170,7 @@ def get_products(request):
     """
     try:
         # Configurar paginación estándar
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_PRODUCTS
+        paginator = ProductPagination()
         page_str = request.query_params.get('page', '1')
         cache_key_base = CacheKeys.PRODUCTS_LIST
 
@@ -518,7 +522,7 @@ def create_product(request):
         if category_ids:
             from .models import ProductCategory
             from api.categories.models import Category
-            existing = Category.objects.filter(id__in=category_ids)
+            existing = Category.objects.filter(id__in=category_ids).only("id")
             for idx, cat in enumerate(existing):
                 ProductCategory.objects.create(
                     product=product,
@@ -78,7 +78,10 @@ class PromotionScopeCategory(models.Model):
         verbose_name_plural = "Promoción por Categorías"
         indexes = [
             models.Index(fields=['category'], name='idx_psc_category'),
-            models.Index(fields=['promotion'], name='idx_psc_promotion')
+            models.Index(fields=['promotion'], name='idx_psc_promotion'),
+            # EXISTS "categoría con promoción" resuelto solo con el índice
+            models.Index(fields=['category', 'promotion'],
+                         name='idx_psc_category_promo')
         ]
 
 
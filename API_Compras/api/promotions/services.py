@@ -709,10 +709,10 @@ def update_promotion(promotion_id: int, user_id: int, name: str | None = None, a
 
     promotion.updated_by = user
     update_fields.extend(['updated_by', 'updated_at'])
+    # La instancia en memoria ya tiene los valores guardados (incluido
+    # updated_at, que asigna auto_now en save): no hace falta releerla
     promotion.save(update_fields=update_fields)
 
-    promotion.refresh_from_db()
-
     response = {
         "success": True,
         "message": "Promotion updated successfully",
@@ -885,10 +885,9 @@ def update_rule(rule_id: int, user_id: int, type: str | None = None, value: Deci
 
     rule.updated_by = user
     update_fields.extend(['updated_by', 'updated_at'])
+    # La instancia en memoria ya tiene los valores guardados
     rule.save(update_fields=update_fields)
 
-    rule.refresh_from_db()
-
     response = {
         "success": True,
         "message": "Promotion rule updated successfully",
@@ -19,6 +19,13 @@ from api.response_helpers import success_response, server_error_response, valida
 
 logger = logging.getLogger(__name__)
 
+PAGINATION_PAGE_SIZE_PROMOTIONS = 10
+
+
+class PromotionPagination(PageNumberPagination):
+    """Paginador de promociones con el tamaño de página fijado a nivel de clase."""
+    page_size = PAGINATION_PAGE_SIZE_PROMOTIONS
+
 
 @swagger_auto_schema(
     method='get',
@@ -49,8 +56,7 @@ def list_active_promotions(request):
         )
 
         # Configurar paginación estándar
-        paginator = PageNumberPagination()
-        paginator.page_size = 10  # Tamaño de página para promociones
+        paginator = PromotionPagination()
 
         # Aplicar paginación estándar al queryset con prefetch optimizado
         page_data = paginator.paginate_queryset(queryset, request)
@@ -105,8 +111,7 @@ def list_promotions_active_products(request):
         promotions_data = services.get_active_promotions_product(product_id)
 
         # Configurar paginación estándar para las promociones
-        paginator = PageNumberPagination()
-        paginator.page_size = 10  # Tamaño de página para promociones de productos
+        paginator = PromotionPagination()
 
         # Aplicar paginación estándar a la lista de promociones
         page_data = paginator.paginate_queryset(promotions_data, request)
@@ -141,8 +146,7 @@ def list_categories_with_active_promotions(request):
         categories_data = services.get_categories_with_active_promotions()
 
         # Configurar paginación estándar para las categorías
-        paginator = PageNumberPagination()
-        paginator.page_size = 10  # Tamaño de página para categorías con promociones
+        paginator = PromotionPagination()
 
         # Aplicar paginación estándar a la lista de categorías
         page_data = paginator.paginate_queryset(categories_data, request)
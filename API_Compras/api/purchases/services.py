@@ -3,7 +3,8 @@ from api.promotions.services import calculate_discounted_price_product
 from .models import Purchase, PurchaseDetail
 from api.products.models import Product
 from api.inventories.models import InventoryRecord
-from api.inventories.services import exit_sale_inventory, return_entry_inventory
+from api.inventories.services import (
+    StockContentionError, exit_sale_inventory, return_entry_inventory_bulk)
 from django.shortcuts import get_object_or_404
 from api.utils import validate_id
 from django.utils import timezone
@@ -163,7 +164,8 @@ def create_purchase_detail(purchase_id: int, product: Product, quantity: int, lo
         dict: Respuesta con datos del detalle creado
 
     Raises:
-        ValueError: Si no hay stock suficiente o datos inválidos
+        ValueError: Si no hay stock suficiente, está en uso por otra
+            operación concurrente o los datos son inválidos
     """
 
     validate_id(purchase_id, 'Purchase')
@@ -214,9 +216,15 @@ def create_purchase_detail(purchase_id: int, product: Product, quantity: int, lo
         subtotal=subtotal
     )
 
-    discount_stock = exit_sale_inventory(product=product, from_location=stock_in_location.pk,
-                                         description=f"Purchase Detail ID: {purchase_detail.pk}",
-                                         quantity=quantity, reference_id=purchase_detail.pk, user=purchase.user)
+    try:
+        discount_stock = exit_sale_inventory(product=product, from_location=stock_in_location.pk,
+                                             description=f"Purchase Detail ID: {purchase_detail.pk}",
+                                             quantity=quantity, reference_id=purchase_detail.pk, user=purchase.user)
+    except StockContentionError as e:
+        # Stock retenido por otra operación concurrente: la compra se revierte
+        # completa (create_purchase es atómica) y el cliente puede reintentar
+        raise ValueError(
+            "Stock in use by another operation, retry the purchase.") from e
 
     if not discount_stock.get("success", False):
         raise ValueError("Failed to update inventory ")
@@ -815,92 +823,94 @@ def delete_purchase_admin(purchase_id: int, admin_user_id: int, force_delete: bo
             from api.inventories.models import InventoryMovement
             from api.storage_location.models import StorageLocation
 
+            # Última salida por venta de cada detalle, en una sola consulta
+            # (reference_id referencia al PurchaseDetail)
+            last_exit_movements = {}
+            for movement in InventoryMovement.objects.filter(
+                reason=InventoryMovement.Reason.EXIT_SALE,
+                reference_type=InventoryMovement.RefType.SALE,
+                reference_id__in=[detail.id for detail in purchase_details]
+            ).select_related('from_location').order_by('-occurred_at'):
+                last_exit_movements.setdefault(
+                    (movement.reference_id, movement.product_id), movement)
+
+            # Ubicación de respaldo para los detalles sin salida registrada
+            default_location = None
+            if any((detail.id, detail.product_id) not in last_exit_movements
+                   for detail in purchase_details):
+                default_location = StorageLocation.objects.first()
+
+            # Se arman todas las entradas y se registran juntas (registros y
+            # movimientos) con return_entry_inventory_bulk
+            entries = []
+            entry_items = []
             for detail in purchase_details:
-                related_movements = InventoryMovement.objects.filter(
-                    product=detail.product,
-                    reason=InventoryMovement.Reason.EXIT_SALE,
-                    reference_type=InventoryMovement.RefType.SALE,
-                    reference_id=detail.id  # Referencia al PurchaseDetail
-                ).select_related('from_location').order_by('-occurred_at')
-
-                if related_movements.exists():
-                    last_movement = related_movements.first()
-
-                    if last_movement is not None:
-                        target_location = last_movement.from_location  # type: ignore
-
-                        if target_location:
-                            expiry_date = getattr(
-                                last_movement, 'expiry_date', None)
-                            batch_code = getattr(
-                                last_movement, 'batch_code', None)
-
-                            revert_result = return_entry_inventory(
-                                product=detail.product,
-                                to_location=target_location,
-                                expiry_date=expiry_date,
-                                batch_code=batch_code,
-                                description=f"Stock return from deleted purchase ID: {purchase_id}",
-                                quantity=detail.quantity,
-                                reference_id=purchase_id,
-                                user=admin_user  # type: ignore
-                            )
-
-                            if revert_result.get("success", False):
-                                expiry_date_iso = expiry_date.isoformat() if expiry_date and hasattr(
-                                    expiry_date, 'isoformat') else None
-                                reverted_items.append({
-                                    "product_id": detail.product.id,
-                                    "product_name": detail.product.name,
-                                    "quantity_restored": detail.quantity,
-                                    "location": target_location.name,
-                                    "batch_code": batch_code,
-                                    "expiry_date": expiry_date_iso
-                                })
-                            else:
-                                logger.error(
-                                    f"Failed to revert inventory for product {detail.product.id} "
-                                    f"from deleted purchase {purchase_id}: {revert_result.get('message', 'Unknown error')}"
-                                )
-                        else:
-                            logger.warning(
-                                f"No source location found for product {detail.product.id} in purchase {purchase_id}")
+                last_movement = last_exit_movements.get(
+                    (detail.id, detail.product_id))
+
+                if last_movement is not None:
+                    target_location = last_movement.from_location  # type: ignore
+
+                    if target_location:
+                        expiry_date = getattr(
+                            last_movement, 'expiry_date', None)
+                        batch_code = getattr(
+                            last_movement, 'batch_code', None)
+
+                        entries.append({
+                            "product": detail.product,
+                            "to_location": target_location,
+                            "expiry_date": expiry_date,
+                            "batch_code": batch_code,
+                            "description": f"Stock return from deleted purchase ID: {purchase_id}",
+                            "quantity": detail.quantity,
+                            "reference_id": purchase_id,
+                        })
+                        expiry_date_iso = expiry_date.isoformat() if expiry_date and hasattr(
+                            expiry_date, 'isoformat') else None
+                        entry_items.append({
+                            "product_id": detail.product.id,
+                            "product_name": detail.product.name,
+                            "quantity_restored": detail.quantity,
+                            "location": target_location.name,
+                            "batch_code": batch_code,
+                            "expiry_date": expiry_date_iso
+                        })
+                    else:
+                        logger.warning(
+                            f"No source location found for product {detail.product.id} in purchase {purchase_id}")
+                elif default_location:
+                    entries.append({
+                        "product": detail.product,
+                        "to_location": default_location,
+                        "expiry_date": None,
+                        "batch_code": None,
+                        "description": f"Stock return from deleted purchase ID: {purchase_id} (fallback location)",
+                        "quantity": detail.quantity,
+                        "reference_id": purchase_id,
+                    })
+                    entry_items.append({
+                        "product_id": detail.product.id,
+                        "product_name": detail.product.name,
+                        "quantity_restored": detail.quantity,
+                        "location": default_location.name,
+                        "batch_code": None,
+                        "expiry_date": None,
+                        "note": "Restored to default location (original location not found)"
+                    })
                 else:
-                    try:
-                        # Obtener la primera ubicación disponible como fallback
-                        default_location = StorageLocation.objects.first()
-                        if default_location:
-                            revert_result = return_entry_inventory(
-                                product=detail.product,
-                                to_location=default_location,
-                                expiry_date=None,
-                                batch_code=None,
-                                description=f"Stock return from deleted purchase ID: {purchase_id} (fallback location)",
-                                quantity=detail.quantity,
-                                reference_id=purchase_id,
-                                user=admin_user  # type: ignore
-                            )
-
-                            if revert_result.get("success", False):
-                                reverted_items.append({
-                                    "product_id": detail.product.id,
-                                    "product_name": detail.product.name,
-                                    "quantity_restored": detail.quantity,
-                                    "location": default_location.name,
-                                    "batch_code": None,
-                                    "expiry_date": None,
-                                    "note": "Restored to default location (original location not found)"
-                                })
-                            else:
-                                logger.error(
-                                    f"Failed to revert inventory to default location for product {detail.product.id}")
-                        else:
-                            logger.error(
-                                "No storage locations available for inventory reversion")
-                    except Exception as fallback_error:
-                        logger.error(
-                            f"Fallback inventory reversion failed: {str(fallback_error)}")
-
+                    logger.error(
+                        "No storage locations available for inventory reversion")
+
+            if entries:
+                revert_result = return_entry_inventory_bulk(
+                    entries, user=admin_user)  # type: ignore
+                if revert_result.get("success", False):
+                    reverted_items = entry_items
+                else:
+                    logger.error(
+                        f"Failed to revert inventory from deleted purchase {purchase_id}: "
+                        f"{revert_result.get('message', 'Unknown error')}")
             inventory_reverted = len(reverted_items) > 0
 
         except Exception as e:
@@ -71,6 +71,32 @@ def test_create_purchase_detail_insufficient_stock(monkeypatch, user):
             purchase_id=purchase.pk, product=product, quantity=5, location_ids=[loc.pk])
 
 
+@pytest.mark.django_db
+def test_create_purchase_detail_stock_contention_raises_value_error(monkeypatch, user):
+    from api.inventories.services import StockContentionError
+
+    product = Product.objects.create(
+        product_code='P3', name='Prod3', unit_price=Decimal('5.00'))
+    loc = StorageLocation.objects.create(
+        name='L3', street='S', street_number='3', state='S', city='C', country='Ct')
+    InventoryRecord.objects.create(
+        product=product, location=loc, quantity=5, batch_code='B3')
+
+    purchase = Purchase.objects.create(user_id=user.pk, purchase_date=timezone.now(), total_amount=Decimal(
+        '0.00'), total_installments_count=1, status=Purchase.Status.OPEN, created_by=user)
+
+    def locked_exit_sale_inventory(*args, **kwargs):
+        raise StockContentionError("Stock en uso por otra operación en L3, reintente.")
+
+    monkeypatch.setattr(
+        'api.purchases.services.exit_sale_inventory', locked_exit_sale_inventory)
+
+    with pytest.raises(ValueError, match="retry") as exc:
+        purchase_services.create_purchase_detail(
+            purchase_id=purchase.pk, product=product, quantity=2, location_ids=[loc.pk])
+    assert isinstance(exc.value.__cause__, StockContentionError)
+
+
 @pytest.mark.django_db
 def test_create_purchase_happy(monkeypatch, user):
     # create two products and monkeypatch create_purchase_detail to avoid inventory complexity
@@ -145,3 +171,57 @@ def test_update_purchase_installments_and_discount(user):
     disc_resp = purchase_services.update_purchase_discount(
         purchase_id=purchase.pk, new_discount=Decimal('5.00'), user_id=user.pk)
     assert disc_resp['success'] is True
+
+
+@pytest.mark.django_db
+def test_delete_purchase_admin_restores_stock_and_bulk_inserts_movements(user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from api.inventories.models import InventoryMovement
+    admin = User.objects.create(username='admin', is_staff=True)
+    loc = StorageLocation.objects.create(
+        name='LD', street='S', street_number='3', state='S', city='C', country='Ct')
+    sale_loc = StorageLocation.objects.create(
+        name='LS', street='S', street_number='4', state='S', city='C', country='Ct')
+
+    def make_purchase(lines):
+        purchase = Purchase.objects.create(user_id=user.pk, purchase_date=timezone.now(), total_amount=Decimal(
+            '0.00'), total_installments_count=1, status=Purchase.Status.OPEN, created_by=user)
+        products = []
+        for n in range(lines):
+            p = Product.objects.create(
+                product_code=f'DP{purchase.pk}-{n}', name=f'DP{purchase.pk}-{n}', unit_price=Decimal('1.00'))
+            InventoryRecord.objects.create(product=p, location=loc, quantity=5)
+            detail = PurchaseDetail.objects.create(purchase=purchase, product=p, quantity=n + 1, unit_price_at_purchase=p.unit_price, subtotal=(
+                p.unit_price * (n + 1)).quantize(Decimal('0.01')))
+            products.append(p)
+            # El primer detalle salió de otro depósito: la devolución vuelve a ese lote
+            if n == 0:
+                InventoryMovement.objects.create(
+                    product=p, from_location=sale_loc, quantity=1, batch_code='LOT1',
+                    expiry_date=timezone.now().date(), reason=InventoryMovement.Reason.EXIT_SALE,
+                    reference_type=InventoryMovement.RefType.SALE, reference_id=detail.pk)
+        return purchase, products
+
+    def delete(purchase):
+        with CaptureQueriesContext(connection) as ctx:
+            res = purchase_services.delete_purchase_admin(
+                purchase_id=purchase.pk, admin_user_id=admin.pk)
+        return res, len(ctx.captured_queries)
+
+    purchase, products = make_purchase(2)
+    res, two_lines = delete(purchase)
+
+    assert res['data']['inventory_reverted'] is True
+    assert len(res['data']['reverted_items']) == 2
+    returned = InventoryRecord.objects.get(product=products[0], location=sale_loc)
+    assert (returned.batch_code, returned.quantity) == ('LOT1', 1)
+    assert [InventoryRecord.objects.get(product=p, location=loc).quantity for p in products] == [5, 7]
+    assert InventoryMovement.objects.filter(
+        reason=InventoryMovement.Reason.RETURN_ENTRY, reference_id=purchase.pk).count() == 2
+
+    # La reversión no agrega consultas por línea de compra
+    purchase, _ = make_purchase(5)
+    res, five_lines = delete(purchase)
+    assert len(res['data']['reverted_items']) == 5
+    assert five_lines == two_lines
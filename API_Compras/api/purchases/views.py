@@ -37,6 +37,11 @@ logger = logging.getLogger(__name__)
 PAGINATION_PAGE_SIZE_PURCHASES = 10
 
 
+class PurchasePagination(PageNumberPagination):
+    """Paginador de compras con el tamaño de página fijado a nivel de clase."""
+    page_size = PAGINATION_PAGE_SIZE_PURCHASES
+
+
 @swagger_auto_schema(
     method='patch',
     operation_summary="Actualizar estado de compra",
@@ -472,8 +477,7 @@ def get_my_purchases(request):
             id__in=purchase_ids).order_by('-created_at')
 
         # Aplicar paginación estándar
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_PURCHASES
+        paginator = PurchasePagination()
         paginated_purchases = paginator.paginate_queryset(
             purchases_queryset, request)
 
@@ -583,8 +587,7 @@ def get_admin_all_purchases(request):
                 id__in=purchase_ids).order_by('-created_at')
 
             # Aplicar paginación estándar
-            paginator = PageNumberPagination()
-            paginator.page_size = PAGINATION_PAGE_SIZE_PURCHASES
+            paginator = PurchasePagination()
             paginated_purchases = paginator.paginate_queryset(
                 purchases_queryset, request)
 
@@ -642,8 +645,7 @@ def purchase_list_create(request):
                 user=user).order_by('-created_at')
 
         # Aplicar paginación estándar
-        paginator = PageNumberPagination()
-        paginator.page_size = PAGINATION_PAGE_SIZE_PURCHASES
+        paginator = PurchasePagination()
         paginated_purchases = paginator.paginate_queryset(purchases, request)
 
         # Serializar los datos paginados
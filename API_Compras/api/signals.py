@@ -1,11 +1,16 @@
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.conf import settings
 from api.payments.models import Installment
 from api.purchases.models import Purchase
 from api.users.models import CustomUser
+from api.categories.models import Category
+from api.categories.utils import bump_categories_cache_version
+from api.inventories.utils import movement_targets_cache
+from api.products.models import Product
+from api.storage_location.models import StorageLocation
 from api.models import NotificationLog
 from api.constants import NotificationCodes
 from .utils import get_notification_by_code
@@ -511,6 +516,43 @@ def send_account_updated_notification(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_categories_version_on_change(sender, instance, **kwargs):
+    """
+    Signal que renueva la versión de categorías cuando una categoría cambia.
+
+    La versión alimenta los ETag/Last-Modified de los endpoints públicos de
+    categorías, por lo que cualquier alta, modificación o baja (incluidas las
+    hechas desde el admin de Django) invalida las copias en cache de clientes.
+
+    Args:
+        sender: Modelo que envía la señal (Category)
+        instance (Category): Instancia de la categoría modificada
+        **kwargs: Argumentos adicionales del signal
+    """
+    bump_categories_cache_version()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=StorageLocation)
+@receiver(post_delete, sender=StorageLocation)
+def clear_movement_targets_cache_on_change(sender, instance, **kwargs):
+    """
+    Signal que vacía el cache local de productos y ubicaciones de inventario.
+
+    Evita que el proceso que modificó un producto o una ubicación siga
+    registrando movimientos con el nombre anterior o con un ID eliminado.
+
+    Args:
+        sender: Modelo que envía la señal (Product o StorageLocation)
+        instance: Instancia modificada
+        **kwargs: Argumentos adicionales del signal
+    """
+    movement_targets_cache.clear()
+
+
 def send_payment_error_notification(installment, error_details: str):
     """
     Función auxiliar que envía notificación por email cuando ocurre un error en el pago de una cuota.
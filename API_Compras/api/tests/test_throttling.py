@@ -0,0 +1,60 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from api import throttling
+
+
+class _FakeScript:
+    """Emula el script Lua de ventana fija (INCR + EXPIRE + TTL)."""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = 0
+
+    def __call__(self, keys, args):
+        self.calls += 1
+        key, duration, limit = keys[0], args[0], args[1]
+        count, _ = self.store.get(key, (0, duration))
+        self.store[key] = (count + 1, duration)
+        return [count + 1, duration if count + 1 > limit else -1]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.script = _FakeScript({})
+
+    def register_script(self, source):
+        return self.script
+
+
+def _anon_request():
+    return Request(APIRequestFactory().get('/api/v2/categories/', REMOTE_ADDR='10.0.0.1'))
+
+
+def test_redis_throttle_counts_in_one_call_per_request(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(throttling, "_get_redis_client", lambda: fake)
+    monkeypatch.setattr(throttling, "_incr_window_scripts", {})
+    monkeypatch.setattr(throttling.RedisAnonRateThrottle, "THROTTLE_RATES", {"anon": "2/min"})
+
+    results = []
+    for _ in range(3):
+        throttle = throttling.RedisAnonRateThrottle()
+        results.append(throttle.allow_request(_anon_request(), None))
+
+    assert results == [True, True, False]
+    assert fake.script.calls == 3
+    assert throttle.wait() == 60
+
+
+def test_redis_throttle_falls_back_to_drf_without_redis(monkeypatch):
+    monkeypatch.setattr(throttling, "_get_redis_client", lambda: None)
+    monkeypatch.setattr(throttling.RedisAnonRateThrottle, "THROTTLE_RATES", {"anon": "1/min"})
+    from django.core.cache import cache
+    cache.clear()
+
+    assert throttling.RedisAnonRateThrottle().allow_request(_anon_request(), None) is True
+    throttle = throttling.RedisAnonRateThrottle()
+    assert throttle.allow_request(_anon_request(), None) is False
+    assert throttle.wait() > 0
@@ -9,3 +9,43 @@ def test_urls_reverse_and_resolution_and_view_integration():
     assert 'notification-templates' in reverse(list_name)
     with pytest.raises(Exception):
         reverse(detail_name)
+
+
+@pytest.mark.django_db
+def test_schema_view_generates_schema_once_per_process(monkeypatch):
+    from rest_framework.test import APIClient
+    from drf_spectacular.generators import SchemaGenerator
+    from SistemaCompras.urls import NoThrottleSpectacularAPIView
+
+    calls = []
+    original = SchemaGenerator.get_schema
+
+    def counting_get_schema(self, *args, **kwargs):
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(SchemaGenerator, "get_schema", counting_get_schema)
+    monkeypatch.setattr(NoThrottleSpectacularAPIView, "_schemas", {})
+
+    client = APIClient()
+    first = client.get('/api/v2/schema/', HTTP_ACCEPT='application/vnd.oai.openapi+json')
+    second = client.get('/api/v2/schema/', HTTP_ACCEPT='application/vnd.oai.openapi+json')
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_schema_view_does_not_cache_arbitrary_version_or_language(monkeypatch):
+    from rest_framework.test import APIClient
+    from SistemaCompras.urls import NoThrottleSpectacularAPIView
+
+    schemas = {}
+    monkeypatch.setattr(NoThrottleSpectacularAPIView, "_schemas", schemas)
+
+    client = APIClient()
+    for query in ('?version=x0', '?version=x1', '?lang=fr', '?lang=de', ''):
+        response = client.get(f'/api/v2/schema/{query}',
+                              HTTP_ACCEPT='application/vnd.oai.openapi+json')
+        assert response.status_code == 200
+    assert list(schemas) == [(None, 'es-ar')]
@@ -0,0 +1,102 @@
+from django.core.cache import cache
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+import logging
+
+logger = logging.getLogger(__name__)
+
+# INCR + EXPIRE atómicos en un solo round trip a Redis. El TTL solo se fija
+# al abrir la ventana (primer request), de modo que la ventana es fija.
+_INCR_WINDOW_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+if tonumber(current) > tonumber(ARGV[2]) then
+    return {current, redis.call('TTL', KEYS[1])}
+end
+return {current, -1}
+"""
+
+_incr_window_scripts = {}
+
+
+def _get_redis_client():
+    """
+    Obtiene el cliente Redis del cache por defecto, si el backend es django-redis.
+
+    Returns:
+        Redis | None: Cliente de escritura, o None si el backend no es Redis
+            (p. ej. LocMemCache en desarrollo y tests).
+    """
+    client = getattr(cache, "client", None)
+    if client is None or not hasattr(client, "get_client"):
+        return None
+    return client.get_client(write=True)
+
+
+def _get_incr_window_script(redis_client):
+    """
+    Devuelve el script Lua registrado para el cliente (EVALSHA tras el primer uso).
+
+    Args:
+        redis_client (Redis): Cliente Redis.
+
+    Returns:
+        Script: Script registrado de redis-py.
+    """
+    script = _incr_window_scripts.get(id(redis_client))
+    if script is None:
+        script = redis_client.register_script(_INCR_WINDOW_SCRIPT)
+        _incr_window_scripts[id(redis_client)] = script
+    return script
+
+
+class RedisRateThrottleMixin:
+    """
+    Throttle de ventana fija sobre Redis con un contador atómico por cliente.
+
+    Reemplaza el historial de timestamps de SimpleRateThrottle (get + set de
+    una lista completa por request, sin atomicidad entre workers) por un único
+    EVALSHA que incrementa el contador y fija su expiración. Si el backend de
+    cache no es Redis se usa el comportamiento estándar de DRF. Si Redis falla
+    el request se permite, igual que con IGNORE_EXCEPTIONS del cache.
+    """
+
+    def allow_request(self, request, view):
+        redis_client = _get_redis_client()
+        if redis_client is None:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            count, ttl = _get_incr_window_script(redis_client)(
+                keys=[cache.make_key(self.key)],
+                args=[self.duration, self.num_requests]
+            )
+        except Exception as e:
+            logger.warning(f"Throttle Redis no disponible, se permite el request: {e}")
+            return True
+
+        if int(count) > self.num_requests:
+            self._wait = int(ttl) if int(ttl) > 0 else self.duration
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        if hasattr(self, "_wait"):
+            return self._wait
+        return super().wait()
+
+
+class RedisUserRateThrottle(RedisRateThrottleMixin, UserRateThrottle):
+    """Throttle por usuario autenticado (scope 'user') respaldado por Redis."""
+
+
+class RedisAnonRateThrottle(RedisRateThrottleMixin, AnonRateThrottle):
+    """Throttle por IP para anónimos (scope 'anon') respaldado por Redis."""
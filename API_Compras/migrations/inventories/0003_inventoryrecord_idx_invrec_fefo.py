@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventories', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventoryrecord',
+            index=models.Index(fields=['product', 'location', 'expiry_date', 'id'], name='idx_invrec_fefo'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-17 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventories', '0003_inventoryrecord_idx_invrec_fefo'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='inventoryrecord',
+            name='idx_invrec_prod_loc_bat_exp',
+        ),
+    ]
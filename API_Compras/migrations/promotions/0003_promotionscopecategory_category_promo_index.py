@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_initial'),
+        ('promotions', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='promotionscopecategory',
+            index=models.Index(fields=['category', 'promotion'], name='idx_psc_category_promo'),
+        ),
+    ]